@@ -6,8 +6,8 @@ import discord
 from discord.ext import commands
 import logging
 import asyncio
-from datetime import datetime
-import pytz
+import os
+from collections import OrderedDict
 
 from bot.scheduler import MessageScheduler
 from bot.commands import BotCommands
@@ -15,14 +15,24 @@ from config.settings import Settings
 from utils.application_manager import ApplicationManager
 from utils.notification_system import NotificationSystem
 from utils.analytics import Analytics
+from utils.storage import load_json_file, write_json_atomic
 
 class ScheduledBot(commands.Bot):
     """예약 메시지 기능이 있는 디스코드 봇."""
     
+    MAX_SCHEDULE_MESSAGE_IDS = 512  # 댓글 응답을 위해 기억할 최근 스케줄 메시지 수
+    SCHEDULE_IDS_FILE = "config/schedule_message_ids.json"  # 재시작 후에도 댓글 응답을 위해 저장
+    PERSIST_BATCH_SIZE = 32  # 한 번에 파일에 반영할 최대 신청 수
+    PERSIST_FLUSH_SECONDS = 2  # 배치를 모으는 최대 대기 시간(초)
+    _PERSIST_STOP = object()  # 저장 워커 종료 신호 (앞서 들어온 기록을 모두 저장한 뒤 종료)
+    
     def __init__(self, settings: Settings):
         """설정으로 봇을 초기화합니다."""
-        # 인텐트 설정 (메시지 내용 읽기 권한 포함)
-        intents = discord.Intents.default()
+        # 인텐트 설정: 필요한 이벤트만 구독 (서버/채널, 서버·DM 메시지, 메시지 내용)
+        intents = discord.Intents.none()
+        intents.guilds = True
+        intents.guild_messages = True
+        intents.dm_messages = True
         intents.message_content = True
         
         # 봇 초기화
@@ -34,16 +44,54 @@ class ScheduledBot(commands.Bot):
         
         self.settings = settings
         self.logger = logging.getLogger(__name__)
+        # 봇 상태는 재연결 때마다 같은 객체를 재사용
+        self._activity = discord.Activity(
+            type=discord.ActivityType.watching,
+            name="예약 메시지 대기 중"
+        )
         self.scheduler = None
-        self.schedule_message_ids = set()  # 스케줄 메시지 ID 저장
+        self.schedule_message_ids = OrderedDict()  # 스케줄 메시지 ID 저장 (가장 오래 사용되지 않은 것부터)
         self.application_manager = None
         self.notification_system = None
         self.analytics = None
+        self._persist_queue = None  # (신청 기록, 통계 기록) 쌍 또는 ID 저장 요청(None)을 모으는 큐
+        self._persist_task = None
+        self.admin_users = {}  # {관리자 ID: discord.User} 미리 받아 둔 관리자 객체
         
+    def remember_schedule_message(self, message_id: int):
+        """댓글 응답용 스케줄 메시지 ID를 저장하고, 한도를 넘으면 가장 오래 사용되지 않은 것을 버립니다."""
+        self.schedule_message_ids[message_id] = None
+        self.schedule_message_ids.move_to_end(message_id)
+        if len(self.schedule_message_ids) > self.MAX_SCHEDULE_MESSAGE_IDS:
+            self.schedule_message_ids.popitem(last=False)
+        # 파일 저장은 저장 워커가 모아서 처리
+        if self._persist_queue is not None:
+            self._persist_queue.put_nowait(None)
+    
+    def _load_schedule_message_ids(self):
+        """저장된 스케줄 메시지 ID를 불러옵니다."""
+        if not os.path.exists(self.SCHEDULE_IDS_FILE):
+            return
+        try:
+            message_ids = load_json_file(self.SCHEDULE_IDS_FILE)
+            for message_id in message_ids[-self.MAX_SCHEDULE_MESSAGE_IDS:]:
+                self.schedule_message_ids[int(message_id)] = None
+            self.logger.info(f"스케줄 메시지 ID {len(self.schedule_message_ids)}개 로드됨")
+        except Exception as e:
+            self.logger.error(f"스케줄 메시지 ID 로드 실패: {e}")
+    
+    def _save_schedule_message_ids(self, message_ids):
+        """스케줄 메시지 ID 목록을 파일에 저장합니다."""
+        os.makedirs(os.path.dirname(self.SCHEDULE_IDS_FILE), exist_ok=True)
+        write_json_atomic(self.SCHEDULE_IDS_FILE, message_ids)
+    
     async def setup_hook(self):
         """봇이 시작될 때 호출되는 설정 훅."""
         self.logger.info("봇 설정 중...")
         
+        # 재시작 전에 보낸 스케줄 메시지 ID 복원
+        self._load_schedule_message_ids()
+        
         # 스케줄러 초기화
         self.scheduler = MessageScheduler(self, self.settings)
         
@@ -52,6 +100,10 @@ class ScheduledBot(commands.Bot):
         self.analytics = Analytics(self.settings)
         self.notification_system = NotificationSystem(self, self.settings, self.application_manager)
         
+        # 신청 기록 저장 워커 시작 (파일 쓰기는 이벤트 루프 밖에서 배치로 처리)
+        self._persist_queue = asyncio.Queue()
+        self._persist_task = asyncio.create_task(self._persist_worker())
+        
         # 명령어 cog 추가
         await self.add_cog(BotCommands(self, self.settings, self.scheduler, self.application_manager, self.analytics))
         
@@ -62,6 +114,9 @@ class ScheduledBot(commands.Bot):
         except Exception as e:
             self.logger.error(f"슬래시 명령어 동기화 실패: {e}")
         
+        # 관리자 사용자 객체 미리 가져오기 (DM 알림용)
+        await self._prefetch_admin_users()
+        
         # 스케줄러 시작
         self.scheduler.start()
         
@@ -81,11 +136,7 @@ class ScheduledBot(commands.Bot):
             self.logger.info(f"서버: {guild.name} (ID: {guild.id})")
         
         # 봇 상태 설정
-        activity = discord.Activity(
-            type=discord.ActivityType.watching,
-            name="예약 메시지 대기 중"
-        )
-        await self.change_presence(activity=activity)
+        await self.change_presence(activity=self._activity)
         
         # 설정된 채널들 검증
         await self._validate_channels()
@@ -97,56 +148,159 @@ class ScheduledBot(commands.Bot):
             return
         
         # 스케줄 메시지에 대한 답글인지 확인
-        if hasattr(message, 'reference') and message.reference:
-            if message.reference.message_id in self.schedule_message_ids:
-                try:
-                    # 신청 현황 기록
-                    if self.application_manager:
-                        # 예시: 날짜 추출은 간단히 본문 전체를 리스트로 저장
-                        requested_dates = [message.content.strip()]
-                        self.application_manager.add_application(
-                            message_id=str(message.reference.message_id),
-                            user_id=message.author.id,
-                            user_name=str(message.author),
-                            requested_dates=requested_dates,
-                            additional_info=""
-                        )
-                    # 통계 기록
-                    if self.analytics:
-                        self.analytics.record_application({
-                            'user_id': message.author.id,
-                            'user_name': str(message.author),
-                            'requested_dates': [message.content.strip()],
-                            'applied_at': datetime.now(pytz.timezone(self.settings.timezone)).isoformat(),
-                            'channel_id': message.channel.id
-                        })
-                    # 스케줄 신청 완료 메시지 전송
-                    await message.reply("✅ **스케줄 신청이 완료되었습니다!**\n\n신청해 주셔서 감사합니다. ")
-                    # 확인 이모지 반응 추가
-                    await message.add_reaction("✅")
-                    await message.add_reaction("📅")
-                    self.logger.info(f"스케줄 신청 응답 전송됨: 사용자 {message.author}")
-                except Exception as e:
-                    self.logger.error(f"스케줄 신청 응답 전송 실패: {e}")
+        reference = message.reference
+        if reference is not None and reference.message_id in self.schedule_message_ids:
+            # 답글이 달리는 스케줄 메시지는 최근 사용으로 옮겨 테스트 메시지 등에 밀려나지 않게 함
+            self.schedule_message_ids.move_to_end(reference.message_id)
+            try:
+                # 신청 현황/통계 기록은 큐에 넣고 워커가 배치로 저장
+                if self._persist_queue is not None:
+                    # 예시: 날짜 추출은 간단히 본문 전체를 리스트로 저장
+                    requested_dates = [message.content.strip()]
+                    application_entry = {
+                        'message_id': str(reference.message_id),
+                        'user_id': message.author.id,
+                        'user_name': str(message.author),
+                        'requested_dates': requested_dates,
+                        'additional_info': ""
+                    }
+                    analytics_entry = {
+                        'user_id': message.author.id,
+                        'user_name': str(message.author),
+                        'requested_dates': requested_dates,
+                        'channel_id': message.channel.id,
+                        # 배치 저장 시각이 아니라 답글이 작성된 시각으로 집계
+                        'applied_at': message.created_at.astimezone(self.settings.tz).isoformat()
+                    }
+                    self._persist_queue.put_nowait((application_entry, analytics_entry))
+                # 스케줄 신청 완료 메시지 전송과 확인 이모지 반응을 동시에 처리
+                await asyncio.gather(
+                    message.reply("✅ **스케줄 신청이 완료되었습니다!**\n\n신청해 주셔서 감사합니다. "),
+                    message.add_reaction("✅"),
+                    message.add_reaction("📅")
+                )
+                self.logger.info("스케줄 신청 응답 전송됨: 사용자 %s", message.author)
+            except Exception as e:
+                self.logger.error("스케줄 신청 응답 전송 실패: %s", e)
+        
+        # 접두사로 시작하지 않는 메시지는 명령어 처리 생략
+        if not message.content.startswith(self.settings.command_prefix):
+            return
         
         # 명령어 디버깅
-        if message.content.startswith(self.settings.command_prefix):
-            self.logger.info(f"명령어 감지됨: '{message.content}' (작성자: {message.author}, 채널: {message.channel})")
-            
+        self.logger.info("명령어 감지됨: '%s' (작성자: %s, 채널: %s)", message.content, message.author, message.channel)
+        
         # 명령어 처리
         try:
             await self.process_commands(message)
         except Exception as e:
-            self.logger.error(f"명령어 처리 중 오류: {e}")
-            if message.content.startswith(self.settings.command_prefix):
-                await message.reply(f"명령어 처리 중 오류가 발생했습니다: {e}")
+            self.logger.error("명령어 처리 중 오류: %s", e)
+            await message.reply(f"명령어 처리 중 오류가 발생했습니다: {e}")
+    
+    async def _prefetch_admin_users(self):
+        """설정된 관리자들의 사용자 객체를 한 번에 가져와 저장합니다."""
+        admin_ids = list(getattr(self.settings, 'admin_ids', []))
+        results = await asyncio.gather(
+            *(self.fetch_user(admin_id) for admin_id in admin_ids),
+            return_exceptions=True
+        )
+        for admin_id, result in zip(admin_ids, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"관리자 {admin_id} 정보를 가져오지 못했습니다: {result}")
+            else:
+                self.admin_users[admin_id] = result
+        self.logger.info(f"관리자 {len(self.admin_users)}/{len(admin_ids)}명 정보 로드 완료")
+    
+    async def get_admin_user(self, admin_id: int):
+        """관리자 사용자 객체를 반환합니다 (미리 받아 두지 못한 관리자는 한 번 받아 저장)."""
+        user = self.admin_users.get(admin_id)
+        if user is None:
+            user = self.get_user(admin_id) or await self.fetch_user(admin_id)
+            self.admin_users[admin_id] = user
+        return user
+    
+    async def _persist_worker(self):
+        """큐에 쌓인 신청 기록을 모아 스레드에서 한 번에 저장합니다."""
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                item = await self._persist_queue.get()
+                if item is self._PERSIST_STOP:
+                    return
+                batch.append(item)
+                
+                stop = False
+                deadline = loop.time() + self.PERSIST_FLUSH_SECONDS
+                while len(batch) < self.PERSIST_BATCH_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._persist_queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is self._PERSIST_STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+                
+                # 이벤트 루프에서 ID 목록 스냅샷을 만든 뒤 스레드에서 저장
+                pending, batch = batch, []
+                message_ids = list(self.schedule_message_ids) if None in pending else None
+                try:
+                    await asyncio.to_thread(self._persist_batch, pending, message_ids)
+                except Exception as e:
+                    self.logger.error("신청 기록 저장 실패 (%d건): %s", len(pending), e)
+                
+                if stop:
+                    return
+        finally:
+            # 모으는 도중 취소되어도 이미 성공 응답을 보낸 신청은 버리지 않고 저장
+            if batch:
+                self._persist_batch_now(batch)
+    
+    def _persist_batch(self, batch, message_ids=None):
+        """신청 현황과 통계에 배치를 반영합니다 (각각 파일 저장 한 번)."""
+        if message_ids is not None:
+            # ID 파일 저장에 실패해도 이미 응답한 신청 기록은 계속 저장
+            try:
+                self._save_schedule_message_ids(message_ids)
+            except Exception as e:
+                self.logger.error("스케줄 메시지 ID 저장 실패: %s", e)
+        batch = [entry for entry in batch if entry is not None]
+        if not batch:
+            return
+        if self.application_manager:
+            self.application_manager.add_applications_bulk([application for application, _ in batch])
+        if self.analytics:
+            self.analytics.record_applications_bulk([stats for _, stats in batch])
+    
+    def _drain_persist_queue(self):
+        """종료 시 큐에 남은 신청 기록을 모두 저장합니다."""
+        if self._persist_queue is None:
+            return
+        batch = []
+        while not self._persist_queue.empty():
+            item = self._persist_queue.get_nowait()
+            if item is not self._PERSIST_STOP:
+                batch.append(item)
+        if batch:
+            self._persist_batch_now(batch)
+    
+    def _persist_batch_now(self, batch):
+        """종료 중 남은 배치를 현재 스레드에서 바로 저장합니다."""
+        message_ids = list(self.schedule_message_ids) if None in batch else None
+        try:
+            self._persist_batch(batch, message_ids)
+        except Exception as e:
+            self.logger.error(f"종료 중 신청 기록 저장 실패 ({len(batch)}건): {e}")
     
     async def _validate_channels(self):
         """설정된 모든 채널에 접근 가능한지 검증합니다."""
-        for channel_config in self.settings.scheduled_channels:
-            channel_id = channel_config['channel_id']
-            channel = self.get_channel(channel_id)
-            
+        # 설정된 채널 ID를 채널 객체로 한 번에 변환한 뒤 검증
+        channels = {channel_id: self.get_channel(channel_id) for channel_id in self.settings.scheduled_channels_by_id}
+        for channel_id, channel in channels.items():
             if channel is None:
                 self.logger.warning(f"채널 ID {channel_id}에 접근할 수 없습니다")
             else:
@@ -178,6 +332,22 @@ class ScheduledBot(commands.Bot):
         
         if self.scheduler:
             self.scheduler.shutdown()
+        if self.notification_system:
+            await self.notification_system.shutdown()
+        
+        # 저장 워커가 앞선 기록과 진행 중인 배치를 마칠 때까지 기다린 뒤 남은 큐와 관리자 정리
+        if self._persist_task:
+            self._persist_queue.put_nowait(self._PERSIST_STOP)
+            try:
+                await self._persist_task
+            except Exception as e:
+                self.logger.error(f"신청 기록 저장 워커 종료 중 오류: {e}")
+            self._persist_task = None
+        self._drain_persist_queue()
+        if self.application_manager:
+            self.application_manager.close()
+        if self.analytics:
+            self.analytics.close()
         
         await super().close()
         self.logger.info("봇 종료 완료")
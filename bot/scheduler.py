@@ -2,13 +2,26 @@
 디스코드 봇용 메시지 스케줄링 시스템.
 """
 
+import asyncio
 import logging
 from datetime import datetime, time
+from functools import lru_cache
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-import pytz
 import discord
 
+@lru_cache(maxsize=64)
+def _make_formatter(template: str):
+    """템플릿별 포맷 함수를 만들어 캐시합니다 (datetime을 받아 완성된 메시지를 반환)."""
+    def format_message(dt: datetime) -> str:
+        return template.format(
+            date=dt.strftime("%Y-%m-%d"),
+            month=dt.strftime("%B"),
+            year=dt.year,
+            day=dt.day
+        )
+    return format_message
+
 class MessageScheduler:
     """예약 메시지 게시를 처리합니다."""
     
@@ -17,10 +30,13 @@ class MessageScheduler:
         self.bot = bot
         self.settings = settings
         self.logger = logging.getLogger(__name__)
+        self._dm_semaphore = asyncio.Semaphore(5)  # 관리자 DM 동시 전송 제한
+        self._send_semaphore = asyncio.Semaphore(5)  # 월간 메시지 동시 전송 제한
+        self._send_jobs = {}  # {채널 ID: 월간 발송 작업}
+        self._job_channels = {}  # {작업 ID: [채널 ID]} 다음 실행 정보 표시용
         
         # 시간대로 스케줄러 생성
-        timezone = pytz.timezone(settings.timezone)
-        self.scheduler = AsyncIOScheduler(timezone=timezone)
+        self.scheduler = AsyncIOScheduler(timezone=settings.tz)
         
         # 예약된 작업 설정
         self._setup_scheduled_jobs()
@@ -30,79 +46,111 @@ class MessageScheduler:
         for channel_config in self.settings.scheduled_channels:
             channel_id = channel_config['channel_id']
             message_template = channel_config.get('message', self.settings.default_message)
+            self._send_jobs[channel_id] = self._make_send_job(channel_id, message_template)
             
-            # 매월 20일 오전 9시에 메시지 예약
-            job_id = f"monthly_message_{channel_id}"
-            
-            self.scheduler.add_job(
-                func=self._send_scheduled_message_with_retry,
-                trigger=CronTrigger(
-                    day=20, hour=9, minute=0, second=0
-                ),
-                args=[channel_id, message_template],
-                id=job_id,
-                name=f"채널 {channel_id}용 월간 메시지",
-                replace_existing=True
-            )
-            # 발송 하루 전 관리자 알림 (2번)
-            for admin_id in getattr(self.settings, 'admin_ids', []):
+            # 발송 하루 전 관리자 알림 (채널당 작업 하나로 모든 관리자에게 전송)
+            if getattr(self.settings, 'admin_ids', []):
+                job_id = f"notify_admins_{channel_id}"
                 self.scheduler.add_job(
-                    func=self._notify_admin_before_send,
+                    func=self._notify_admins_before_send,
                     trigger=CronTrigger(
-                        day=19, hour=9, minute=0, second=0
+                        day=19, hour=9, minute=0, second=0,
+                        jitter=30
                     ),
-                    args=[admin_id, channel_id],
-                    id=f"notify_admin_{admin_id}_{channel_id}",
-                    name=f"{admin_id}에게 발송 전 알림",
+                    args=[channel_id],
+                    id=job_id,
+                    name=f"채널 {channel_id} 발송 전 관리자 알림",
+                    misfire_grace_time=3600,
+                    coalesce=True,
                     replace_existing=True
                 )
+                self._job_channels[job_id] = [channel_id]
             
             self.logger.info(f"채널 {channel_id}용 월간 작업 예약됨")
+        
+        if not self._send_jobs:
+            return
+        
+        # 매월 20일 오전 9시에 모든 채널로 한 번에 메시지 발송
+        job_id = "monthly_messages"
+        self.scheduler.add_job(
+            func=self._send_all_monthly,
+            trigger=CronTrigger(
+                day=20, hour=9, minute=0, second=0,
+                jitter=120  # 정각에 몰리지 않도록 최대 2분 분산
+            ),
+            id=job_id,
+            name=f"월간 메시지 ({len(self._send_jobs)}개 채널)",
+            misfire_grace_time=3600,  # 이벤트 루프가 지연되어도 1시간 안이면 발송
+            coalesce=True,
+            replace_existing=True
+        )
+        self._job_channels[job_id] = list(self._send_jobs)
     
-    async def _send_scheduled_message(self, channel_id: int, message_template: str):
-        """지정된 채널에 예약 메시지를 전송합니다."""
-        try:
-            channel = self.bot.get_channel(channel_id)
-            
-            if channel is None:
-                self.logger.error(f"채널 ID {channel_id}를 찾을 수 없습니다")
-                return
-            
-            # 현재 날짜로 메시지 포맷
-            current_date = datetime.now(pytz.timezone(self.settings.timezone))
-            formatted_message = message_template.format(
-                date=current_date.strftime("%Y-%m-%d"),
-                month=current_date.strftime("%B"),
-                year=current_date.year,
-                day=current_date.day
-            )
-            
-            # 메시지 전송
-            sent_message = await channel.send(formatted_message)
-            
-            # 스케줄 메시지 ID를 봇에 저장 (댓글 응답용)
-            self.bot.schedule_message_ids.add(sent_message.id)
-            
-            # 채널 타입 확인 후 로그
-            if hasattr(channel, 'name') and hasattr(channel, 'guild'):
-                self.logger.info(f"예약 메시지 전송 성공: #{channel.name} in {channel.guild.name}")
-            else:
-                self.logger.info(f"예약 메시지 전송 성공: 채널 ID {channel_id}")
-            
-        except discord.Forbidden:
-            self.logger.error(f"채널 {channel_id}에 메시지를 보낼 권한이 없습니다")
-        except discord.HTTPException as e:
-            self.logger.error(f"채널 {channel_id}에 메시지 전송 실패: {e}")
-        except Exception as e:
-            self.logger.error(f"예약 메시지 전송 중 예상치 못한 오류: {e}")
+    async def _send_all_monthly(self):
+        """모든 예약 채널에 월간 메시지를 동시 전송 수를 제한하며 발송합니다."""
+        async def send_limited(send_job):
+            async with self._send_semaphore:
+                await send_job()
+        
+        results = await asyncio.gather(
+            *(send_limited(send_job) for send_job in self._send_jobs.values()),
+            return_exceptions=True
+        )
+        for channel_id, result in zip(self._send_jobs, results):
+            if isinstance(result, Exception):
+                self.logger.error("채널 %s 월간 발송 작업 오류: %s", channel_id, result)
     
-    async def _send_scheduled_message_with_retry(self, channel_id: int, message_template: str, max_retry: int = 3):
+    def _make_send_job(self, channel_id: int, message_template: str):
+        """채널 ID와 포맷 함수를 미리 묶어 둔 월간 발송 작업을 만듭니다."""
+        format_message = _make_formatter(message_template)
+        
+        async def send_job():
+            await self._send_scheduled_message_with_retry(channel_id, message_template, format_message)
+        
+        return send_job
+    
+    async def _send_scheduled_message(self, channel_id: int, format_message):
+        """지정된 채널에 예약 메시지를 전송합니다. 실패하면 예외를 그대로 전달합니다 (로그는 재시도 쪽에서 남김)."""
+        # 캐시에 없으면 API로 조회 (없는 채널이면 NotFound 발생)
+        channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+        
+        # 현재 날짜로 메시지 포맷
+        formatted_message = format_message(datetime.now(self.settings.tz))
+        
+        # 메시지 전송
+        sent_message = await channel.send(formatted_message)
+        
+        # 스케줄 메시지 ID를 봇에 저장 (댓글 응답용)
+        self.bot.remember_schedule_message(sent_message.id)
+        
+        # 채널 타입 확인 후 로그
+        if hasattr(channel, 'name') and hasattr(channel, 'guild'):
+            self.logger.info("예약 메시지 전송 성공: #%s in %s", channel.name, channel.guild.name)
+        else:
+            self.logger.info("예약 메시지 전송 성공: 채널 ID %s", channel_id)
+    
+    async def _send_scheduled_message_with_retry(self, channel_id: int, message_template: str, format_message, max_retry: int = 3):
         """발송 실패시 재시도 및 내역 기록, 실패시 관리자 DM 알림"""
+        error = None
+        attempt = 0
         for attempt in range(1, max_retry+1):
             try:
-                await self._send_scheduled_message(channel_id, message_template)
+                await self._send_scheduled_message(channel_id, format_message)
+            except (discord.Forbidden, discord.NotFound) as e:
+                # 권한 오류나 없는 채널은 재시도해도 결과가 같으므로 바로 실패 처리
+                error = e
+                self.logger.error("채널 %s에 메시지를 보낼 수 없습니다(시도 %d): %s", channel_id, attempt, e)
+                break
+            except Exception as e:
+                error = e
+                self.logger.error("채널 %s 메시지 발송 실패(시도 %d): %s", channel_id, attempt, e)
+                if attempt < max_retry:
+                    # 디스코드가 알려준 대기 시간이 있으면 따르고, 없으면 지수 백오프
+                    await asyncio.sleep(getattr(e, 'retry_after', None) or 2 ** attempt)
+            else:
                 # 발송 성공시 내역 기록
-                self.settings.add_send_log({
+                await asyncio.to_thread(self.settings.add_send_log, {
                     "channel_id": channel_id,
                     "message": message_template,
                     "status": "success",
@@ -110,39 +158,43 @@ class MessageScheduler:
                     "attempt": attempt
                 })
                 return
-            except Exception as e:
-                self.logger.error(f"메시지 발송 실패(시도 {attempt}): {e}")
-                if attempt == max_retry:
-                    # 실패 내역 기록
-                    self.settings.add_send_log({
-                        "channel_id": channel_id,
-                        "message": message_template,
-                        "status": "fail",
-                        "datetime": datetime.now().isoformat(),
-                        "error": str(e),
-                        "attempt": attempt
-                    })
-                    # 관리자에게 DM 알림
-                    await self._notify_admin_send_fail(channel_id, str(e))
+        
+        # 실패 내역 기록
+        await asyncio.to_thread(self.settings.add_send_log, {
+            "channel_id": channel_id,
+            "message": message_template,
+            "status": "fail",
+            "datetime": datetime.now().isoformat(),
+            "error": str(error),
+            "attempt": attempt
+        })
+        # 관리자에게 DM 알림
+        await self._notify_admin_send_fail(channel_id, str(error))
+
+    async def _notify_admins_before_send(self, channel_id: int):
+        """발송 하루 전 모든 관리자에게 DM 알림"""
+        text = f"[알림] 내일 채널 {channel_id}에 예약 메시지가 발송될 예정입니다. 수정할 내용이 있으면 오늘 중 변경해주세요."
+        await asyncio.gather(
+            *(self._dm_admin(admin_id, text) for admin_id in getattr(self.settings, 'admin_ids', [])),
+            return_exceptions=True
+        )
 
-    async def _notify_admin_before_send(self, admin_id: int, channel_id: int):
-        """발송 하루 전 관리자에게 DM 알림"""
-        user = self.bot.get_user(admin_id)
-        if user:
+    async def _dm_admin(self, admin_id: int, text: str):
+        """관리자에게 DM을 전송합니다 (동시 전송 수 제한)."""
+        async with self._dm_semaphore:
             try:
-                await user.send(f"[알림] 내일 채널 {channel_id}에 예약 메시지가 발송될 예정입니다. 수정할 내용이 있으면 오늘 중 변경해주세요.")
+                user = await self.bot.get_admin_user(admin_id)
+                await user.send(text)
             except Exception as e:
-                self.logger.error(f"관리자 DM 발송 실패: {e}")
+                self.logger.error("관리자 DM 발송 실패: %s", e)
 
     async def _notify_admin_send_fail(self, channel_id: int, error_msg: str):
         """발송 실패시 관리자에게 DM 알림"""
-        for admin_id in getattr(self.settings, 'admin_ids', []):
-            user = self.bot.get_user(admin_id)
-            if user:
-                try:
-                    await user.send(f"[경고] 채널 {channel_id} 예약 메시지 발송 실패: {error_msg}")
-                except Exception as e:
-                    self.logger.error(f"관리자 DM 발송 실패: {e}")
+        text = f"[경고] 채널 {channel_id} 예약 메시지 발송 실패: {error_msg}"
+        await asyncio.gather(
+            *(self._dm_admin(admin_id, text) for admin_id in getattr(self.settings, 'admin_ids', [])),
+            return_exceptions=True
+        )
     
     def start(self):
         """스케줄러를 시작합니다."""
@@ -164,43 +216,34 @@ class MessageScheduler:
         """예정된 메시지에 대한 정보를 가져옵니다."""
         jobs_info = []
         for job in self.scheduler.get_jobs():
-            channel_id = int(job.args[0])
-            channel = self.bot.get_channel(channel_id)
-            
-            # 채널 타입 확인
-            if channel and hasattr(channel, 'name'):
-                channel_name = f"#{channel.name}"
-            else:
-                channel_name = f"채널 ID: {channel_id}"
-            
-            jobs_info.append({
-                'channel_name': channel_name,
-                'channel_id': channel_id,
-                'next_run': job.next_run_time,
-                'job_name': job.name
-            })
+            for channel_id in self._job_channels.get(job.id, []):
+                channel = self.bot.get_channel(channel_id)
+                
+                # 채널 타입 확인
+                if channel and hasattr(channel, 'name'):
+                    channel_name = f"#{channel.name}"
+                else:
+                    channel_name = f"채널 ID: {channel_id}"
+                
+                jobs_info.append({
+                    'channel_name': channel_name,
+                    'channel_id': channel_id,
+                    'next_run': job.next_run_time,
+                    'job_name': job.name
+                })
         
         return jobs_info
     
     async def send_test_message(self, channel_id: int):
         """예약 메시지 시스템을 확인하기 위해 테스트 메시지를 전송합니다."""
         # 설정된 채널의 메시지를 찾거나 기본 메시지 사용
-        message_template = self.settings.default_message
-        for channel_config in self.settings.scheduled_channels:
-            if channel_config['channel_id'] == channel_id:
-                message_template = channel_config.get('message', self.settings.default_message)
-                break
+        channel_config = self.settings.scheduled_channels_by_id.get(channel_id)
+        message_template = channel_config.get('message', self.settings.default_message) if channel_config else self.settings.default_message
         
         test_message = f"🧪 **테스트 메시지**\n\n{message_template}\n\n*이것은 예약 메시지 시스템의 테스트였습니다.*"
         
         # 현재 날짜로 포맷
-        current_date = datetime.now(pytz.timezone(self.settings.timezone))
-        formatted_message = test_message.format(
-            date=current_date.strftime("%Y-%m-%d"),
-            month=current_date.strftime("%B"),
-            year=current_date.year,
-            day=current_date.day
-        )
+        formatted_message = _make_formatter(test_message)(datetime.now(self.settings.tz))
         
         # 테스트 메시지 직접 전송
         try:
@@ -213,16 +256,16 @@ class MessageScheduler:
             sent_message = await channel.send(formatted_message)
             
             # 스케줄 메시지 ID를 봇에 저장 (댓글 응답용)
-            self.bot.schedule_message_ids.add(sent_message.id)
+            self.bot.remember_schedule_message(sent_message.id)
             
             # 로그
             if hasattr(channel, 'name') and hasattr(channel, 'guild'):
-                self.logger.info(f"테스트 메시지 전송 성공: #{channel.name} in {channel.guild.name}")
+                self.logger.info("테스트 메시지 전송 성공: #%s in %s", channel.name, channel.guild.name)
             else:
-                self.logger.info(f"테스트 메시지 전송 성공: 채널 ID {channel_id}")
+                self.logger.info("테스트 메시지 전송 성공: 채널 ID %s", channel_id)
             
             return True
             
         except Exception as e:
-            self.logger.error(f"테스트 메시지 전송 중 오류: {e}")
+            self.logger.error("테스트 메시지 전송 중 오류: %s", e)
             return False
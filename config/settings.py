@@ -5,11 +5,18 @@
 import json
 import logging
 import os
+from collections import deque
 from typing import List, Dict, Any
 
+import pytz
+
+from utils.storage import loads_json, dump_json_line, write_bytes_atomic
+
 class Settings:
     """봇 구성과 설정을 관리합니다."""
     
+    MAX_CACHED_SEND_LOGS = 200  # 메모리에 유지할 최근 발송 내역 수
+    
     def __init__(self, config_file: str = "config/config.json"):
         """구성 파일에서 설정을 로드합니다."""
         self.config_file = config_file
@@ -20,19 +27,25 @@ class Settings:
         self.timezone = "UTC"
         self.default_message = "📅 **[이번 달 스케쥴 신청 안내]**\n\n안녕하세요! 이번 달 스케쥴 신청을 **오늘부터 5일간 (20일~25일)** 받습니다.\n\n👉 **아래 댓글로 신청해 주세요:**\n원하는 날짜와 시간을 댓글에 작성해 주시면 됩니다.\n\n✅ **신청 시 유의사항**\n- 다른 직원이 선택한 날짜를 먼저 확인해 주세요.\n- 가능한 한 **중복 없이** 날짜를 배정해 주세요.\n- 신청 마감 후에는 조정이 어려우니, **기간 내 제출** 꼭 부탁드립니다!\n\n감사합니다 🙏"
         self.scheduled_channels = []
+        self.scheduled_channels_by_id = {}  # {channel_id: 채널 구성} 조회용 인덱스
         self.admin_ids = []  # 관리자 디스코드 사용자 ID 목록
-        self.log_file = "config/send_log.json"  # 발송 내역 저장 파일
-        self.send_logs = []  # 발송 내역 메모리 캐시
+        self.admin_id_set = frozenset()  # 관리자 여부 확인용 (구성 로드 시에만 바뀜)
+        self.log_file = "config/send_log.jsonl"  # 발송 내역 저장 파일 (한 줄에 한 건)
+        self.send_logs = deque(maxlen=self.MAX_CACHED_SEND_LOGS)  # 최근 발송 내역 메모리 캐시
+        self.rehost_schedule_images = True  # 스케쥴 이미지를 다시 업로드할지 (False면 원본 URL만 전달)
         
         # 구성 로드
         self._load_config()
+        
+        # 시간대 객체는 한 번만 생성해 재사용
+        self.tz = pytz.timezone(self.timezone)
     
     def _load_config(self):
         """JSON 파일에서 구성을 로드합니다."""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    config = loads_json(f.read())
                 
                 # 로드된 구성으로 설정 업데이트
                 self.command_prefix = config.get('command_prefix', self.command_prefix)
@@ -41,11 +54,17 @@ class Settings:
                 self.scheduled_channels = config.get('scheduled_channels', self.scheduled_channels)
                 self.admin_ids = config.get('admin_ids', self.admin_ids)
                 self.log_file = config.get('log_file', self.log_file)
+                self.rehost_schedule_images = config.get('rehost_schedule_images', self.rehost_schedule_images)
                 # 발송 내역 파일 로드
+                log_dir = os.path.dirname(self.log_file)
+                if log_dir:
+                    os.makedirs(log_dir, exist_ok=True)
                 self._load_send_logs()
                 
                 self.logger.info(f"{self.config_file}에서 구성 로드됨")
                 self._validate_config()
+                self._rebuild_channel_index()
+                self.admin_id_set = frozenset(self.admin_ids)
             else:
                 self.logger.warning(f"구성 파일 {self.config_file}을 찾을 수 없습니다. 기본값 사용")
                 self._create_default_config()
@@ -72,6 +91,10 @@ class Settings:
         
         self.logger.info("구성 검증 통과")
     
+    def _rebuild_channel_index(self):
+        """채널 ID로 구성을 찾기 위한 인덱스를 다시 만듭니다."""
+        self.scheduled_channels_by_id = {c['channel_id']: c for c in self.scheduled_channels}
+    
     def _create_default_config(self):
         """기본 구성 파일을 생성합니다."""
         default_config = {
@@ -109,6 +132,7 @@ class Settings:
             "scheduled_channels": self.scheduled_channels,
             "admin_ids": self.admin_ids,
             "log_file": self.log_file,
+            "rehost_schedule_images": self.rehost_schedule_images,
         }
         
         try:
@@ -122,36 +146,58 @@ class Settings:
             raise
     
     def _load_send_logs(self):
-        """발송 내역 파일을 로드합니다."""
-        import json
-        import os
-        if os.path.exists(self.log_file):
-            try:
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    self.send_logs = json.load(f)
-            except Exception:
-                self.send_logs = []
-        else:
-            self.send_logs = []
+        """발송 내역 파일의 최근 부분만 로드합니다."""
+        self.send_logs = deque(maxlen=self.MAX_CACHED_SEND_LOGS)
+        try:
+            source_file = self.log_file
+            if not os.path.exists(source_file):
+                # 이전 기본 파일(.json)이 남아 있으면 새 이름으로 옮긴 뒤 아래에서 줄 단위 형식으로 변환
+                legacy_file = os.path.splitext(self.log_file)[0] + ".json"
+                if legacy_file == self.log_file or not os.path.exists(legacy_file):
+                    return
+                try:
+                    os.replace(legacy_file, self.log_file)
+                    self.logger.info(f"발송 내역 파일 이동됨: {legacy_file} -> {self.log_file}")
+                except OSError as e:
+                    # 옮기지 못하면 이전 파일을 그대로 읽어 새 파일로 변환 (이전 파일은 남겨 둠)
+                    self.logger.warning(f"발송 내역 파일 이동 실패, 이전 파일을 읽어 변환합니다: {e}")
+                    source_file = legacy_file
+            with open(source_file, 'r', encoding='utf-8') as f:
+                first_line = f.readline()
+                if first_line.lstrip().startswith('['):
+                    # 이전 형식(JSON 배열)은 읽은 뒤 줄 단위 형식으로 변환
+                    self._rewrite_send_logs(loads_json(first_line + f.read()))
+                    return
+                # 파일 끝의 최근 줄만 유지하며 읽음
+                tail = deque(f, maxlen=self.MAX_CACHED_SEND_LOGS)
+                if len(tail) < self.MAX_CACHED_SEND_LOGS:
+                    tail.appendleft(first_line)
+            self.send_logs.extend(loads_json(line) for line in tail if line.strip())
+        except Exception as e:
+            self.logger.error(f"발송 내역 로드 실패: {e}")
+            self.send_logs.clear()
+
+    def _rewrite_send_logs(self, logs: List[dict]):
+        """발송 내역 전체를 줄 단위 형식으로 다시 쓰고 최근 내역만 메모리에 남깁니다."""
+        write_bytes_atomic(self.log_file, "".join(dump_json_line(entry) for entry in logs).encode('utf-8'))
+        self.send_logs.extend(logs)
 
     def add_send_log(self, log_entry: dict):
-        """발송 내역을 추가하고 파일에 저장합니다."""
+        """발송 내역을 추가하고 파일 끝에 한 줄로 기록합니다."""
         self.send_logs.append(log_entry)
-        import json
-        with open(self.log_file, 'w', encoding='utf-8') as f:
-            json.dump(self.send_logs, f, ensure_ascii=False, indent=2)
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(dump_json_line(log_entry))
 
     def get_send_logs(self, limit=10):
         """최근 발송 내역을 반환합니다."""
-        return self.send_logs[-limit:]
+        return list(self.send_logs)[-limit:]
     
-    def add_scheduled_channel(self, channel_id: int, message: str = ""):
-        """새로운 예약 채널을 추가합니다."""
+    def add_scheduled_channel(self, channel_id: int, message: str = "", save: bool = True):
+        """새로운 예약 채널을 추가합니다 (save=False면 파일 저장은 호출자가 담당)."""
         # 채널이 이미 존재하는지 확인
-        for channel_config in self.scheduled_channels:
-            if channel_config['channel_id'] == channel_id:
-                self.logger.warning(f"채널 {channel_id}은 이미 구성됨")
-                return False
+        if channel_id in self.scheduled_channels_by_id:
+            self.logger.warning(f"채널 {channel_id}은 이미 구성됨")
+            return False
         
         # 새 채널 추가
         new_channel = {
@@ -160,19 +206,35 @@ class Settings:
         }
         
         self.scheduled_channels.append(new_channel)
-        self.save_config()
+        self.scheduled_channels_by_id[channel_id] = new_channel
+        if save:
+            self.save_config()
         
         self.logger.info(f"예약 채널 추가됨: {channel_id}")
         return True
     
-    def remove_scheduled_channel(self, channel_id: int):
-        """예약 채널을 제거합니다."""
-        for i, channel_config in enumerate(self.scheduled_channels):
-            if channel_config['channel_id'] == channel_id:
-                del self.scheduled_channels[i]
-                self.save_config()
-                self.logger.info(f"예약 채널 제거됨: {channel_id}")
-                return True
+    def remove_scheduled_channel(self, channel_id: int, save: bool = True):
+        """예약 채널을 제거합니다 (save=False면 파일 저장은 호출자가 담당)."""
+        channel_config = self.scheduled_channels_by_id.pop(channel_id, None)
+        if channel_config is None:
+            self.logger.warning(f"채널 {channel_id}을 구성에서 찾을 수 없음")
+            return False
+        
+        self.scheduled_channels.remove(channel_config)
+        if save:
+            self.save_config()
+        self.logger.info(f"예약 채널 제거됨: {channel_id}")
+        return True
+    
+    def set_channel_message(self, channel_id: int, message: str, save: bool = True):
+        """예약 채널의 메시지를 수정합니다 (save=False면 파일 저장은 호출자가 담당)."""
+        channel_config = self.scheduled_channels_by_id.get(channel_id)
+        if channel_config is None:
+            self.logger.warning(f"채널 {channel_id}을 구성에서 찾을 수 없음")
+            return False
         
-        self.logger.warning(f"채널 {channel_id}을 구성에서 찾을 수 없음")
-        return False
+        channel_config['message'] = message
+        if save:
+            self.save_config()
+        self.logger.info(f"예약 채널 메시지 수정됨: {channel_id}")
+        return True
@@ -2,20 +2,57 @@
 통계 및 분석 시스템.
 """
 
-import json
 import logging
+import os
+import threading
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict, Counter
-import pytz
+from heapq import nlargest
+from operator import itemgetter
+
+from utils.storage import loads_json, load_json_file, dump_json_line, write_json_atomic, write_bytes_atomic
+
+@lru_cache(maxsize=256)
+def _parse_applied_at(applied_at: str) -> datetime:
+    """신청 시각 문자열을 파싱합니다 (같은 시각 문자열이 반복되면 캐시된 결과를 사용)."""
+    return datetime.fromisoformat(applied_at)
+
+def _month_bit(month_key: str) -> int:
+    """'YYYY-MM' 키를 그 해 월 비트마스크의 비트로 변환합니다 (1월이 0번 비트)."""
+    return 1 << (int(month_key[5:7]) - 1)
+
+def _month_masks(application_months) -> Dict[str, int]:
+    """신청 월 기록을 {연도: 월 비트마스크}로 반환합니다 (이전 형식인 'YYYY-MM' 목록/사전도 변환)."""
+    if isinstance(application_months, dict) and len(next(iter(application_months), '')) != 7:
+        return application_months
+    masks = {}
+    for month_key in application_months:
+        masks[month_key[0:4]] = masks.get(month_key[0:4], 0) | _month_bit(month_key)
+    return masks
+
+def _top_counts(counts: Dict, limit: int) -> Dict:
+    """횟수 사전에서 상위 항목만 골라 반환합니다."""
+    return dict(nlargest(limit, counts.items(), key=itemgetter(1)))
 
 class Analytics:
     """스케줄 신청 통계 및 분석을 관리합니다."""
     
+    COMPACT_EVERY = 1000  # 이벤트 로그가 이만큼 쌓이면 스냅샷으로 압축
+    
     def __init__(self, settings, data_file: str = "config/analytics.json"):
         """분석 시스템을 초기화합니다."""
         self.settings = settings
         self.data_file = data_file
+        # 신청 이벤트는 한 줄씩 추가 기록하고, 주기적으로 스냅샷(data_file)에 합침
+        self.events_file = os.path.splitext(data_file)[0] + "_events.jsonl"
+        self._event_log = None
+        self._log_generation = 0  # 현재 이벤트 로그의 세대 (압축할 때마다 1씩 증가)
+        self._pending_events = 0
+        self._top_user_ids = None  # 신청 수 상위 사용자 ID 캐시 (처음 조회할 때 생성)
+        self._top_users_k = 0
+        # 신청 기록은 저장 스레드에서, 보고서 생성은 다른 스레드에서 들어오므로 데이터 접근을 동기화
+        self._lock = threading.RLock()
         self.logger = logging.getLogger(__name__)
         
         # 통계 데이터 구조
@@ -31,16 +68,14 @@ class Analytics:
         self._load_data()
     
     def _load_data(self):
-        """분석 데이터를 파일에서 로드합니다."""
+        """분석 데이터 스냅샷을 로드하고 이후 이벤트 로그를 다시 반영합니다."""
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                self.analytics_data = json.load(f)
+            self.analytics_data = load_json_file(self.data_file)
             self.logger.info("분석 데이터 로드 완료")
         except FileNotFoundError:
             self.logger.info("분석 데이터 파일이 없습니다. 새로 생성합니다.")
-            self._save_data()
         except Exception as e:
-            self.logger.error(f"분석 데이터 로드 실패: {e}")
+            self.logger.error("분석 데이터 로드 실패: %s", e)
             self.analytics_data = {
                 'monthly_stats': {},
                 'user_participation': {},
@@ -48,69 +83,189 @@ class Analytics:
                 'channel_performance': {},
                 'trends': {}
             }
+        
+        # 스냅샷이 이미 포함한 이벤트 로그의 세대와 위치 (이전 형식의 스냅샷에는 없음)
+        covered = self.analytics_data.pop('event_log', None) or {}
+        replayed = self._replay_events(covered.get('generation', -1), covered.get('offset', 0))
+        if replayed or not os.path.exists(self.data_file):
+            self._save_data()
+        if self._event_log is None:
+            if os.path.exists(self.events_file):
+                self._event_log = open(self.events_file, 'a', encoding='utf-8')
+            else:
+                self._start_event_log()
     
-    def _save_data(self):
-        """분석 데이터를 파일에 저장합니다."""
+    def _replay_events(self, covered_generation: int, covered_offset: int) -> int:
+        """스냅샷 이후 이벤트 로그에 쌓인 신청을 통계에 다시 반영합니다."""
+        if not os.path.exists(self.events_file):
+            self._log_generation = covered_generation + 1
+            return 0
+        
+        replayed = 0
+        with open(self.events_file, 'rb') as f:
+            # 첫 줄은 로그 세대 헤더 (헤더가 없는 이전 형식의 로그는 0세대)
+            try:
+                header = loads_json(f.readline())
+            except Exception:
+                header = None
+            if isinstance(header, dict) and 'log_generation' in header:
+                self._log_generation = header['log_generation']
+            else:
+                self._log_generation = 0
+                f.seek(0)
+            
+            if self._log_generation < covered_generation:
+                return 0
+            if self._log_generation == covered_generation:
+                # 스냅샷 저장 직후 로그를 교체하기 전에 종료된 경우: 스냅샷에 포함된 부분은 건너뜀
+                f.seek(max(covered_offset, f.tell()))
+            
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    self._apply_application(loads_json(line))
+                    replayed += 1
+                except Exception as e:
+                    # 비정상 종료로 잘린 마지막 줄 등은 건너뜀
+                    self.logger.warning("분석 이벤트 재반영 실패: %s", e)
+        
+        if replayed:
+            self.logger.info("분석 이벤트 %s건 재반영", replayed)
+        return replayed
+    
+    def _save_data(self) -> bool:
+        """분석 데이터 스냅샷을 저장하고 반영된 이벤트 로그를 다음 세대로 교체합니다."""
+        if self._event_log is not None:
+            self._event_log.flush()
+        offset = os.path.getsize(self.events_file) if os.path.exists(self.events_file) else 0
+        # 스냅샷에 어느 로그의 어디까지 반영했는지 함께 기록하여,
+        # 로그를 교체하기 전에 종료되어도 다음 시작 때 같은 이벤트를 두 번 반영하지 않음
+        snapshot = dict(self.analytics_data)
+        snapshot['event_log'] = {'generation': self._log_generation, 'offset': offset}
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.analytics_data, f, ensure_ascii=False, indent=2)
-            self.logger.debug("분석 데이터 저장 완료")
+            write_json_atomic(self.data_file, snapshot)
         except Exception as e:
-            self.logger.error(f"분석 데이터 저장 실패: {e}")
+            # 스냅샷 저장에 실패하면 이벤트 로그를 그대로 두어 데이터를 잃지 않음
+            self.logger.error("분석 데이터 저장 실패: %s", e)
+            return False
+        
+        if self._event_log is not None:
+            self._event_log.close()
+        self._log_generation += 1
+        self._start_event_log()
+        self._pending_events = 0
+        self.logger.debug("분석 데이터 저장 완료")
+        return True
+    
+    def _start_event_log(self):
+        """현재 세대 헤더만 담은 새 이벤트 로그로 원자적으로 교체하고 추가 모드로 엽니다."""
+        header = dump_json_line({'log_generation': self._log_generation})
+        write_bytes_atomic(self.events_file, header.encode('utf-8'))
+        self._event_log = open(self.events_file, 'a', encoding='utf-8')
+    
+    def _append_events(self, applications: List[Dict]):
+        """신청 이벤트를 로그 끝에 추가하고, 충분히 쌓이면 스냅샷으로 압축합니다."""
+        if not applications:
+            return
+        
+        for application_data in applications:
+            self._event_log.write(dump_json_line(application_data))
+        self._event_log.flush()
+        
+        self._pending_events += len(applications)
+        if self._pending_events >= self.COMPACT_EVERY:
+            self._save_data()
     
+    def close(self):
+        """남은 이벤트를 스냅샷에 합치고 이벤트 로그를 닫습니다."""
+        with self._lock:
+            if self._pending_events:
+                self._save_data()
+            if self._event_log is not None:
+                self._event_log.close()
+                self._event_log = None
+        
     def record_application(self, application_data: Dict):
         """신청 데이터를 기록하고 통계를 업데이트합니다."""
-        try:
-            current_time = datetime.now(pytz.timezone(self.settings.timezone))
-            month_key = current_time.strftime("%Y-%m")
-            
-            # 월별 통계 업데이트
-            self._update_monthly_stats(month_key, application_data)
-            
-            # 사용자 참여도 업데이트
-            self._update_user_participation(application_data)
-            
-            # 인기 시간대 업데이트
-            self._update_popular_times(current_time, application_data)
-            
-            # 채널 성과 업데이트
-            self._update_channel_performance(application_data)
-            
-            # 트렌드 데이터 업데이트
-            self._update_trends(current_time, application_data)
-            
-            self._save_data()
+        with self._lock:
+            try:
+                self._apply_application(application_data)
+                self._append_events([application_data])
+                
+            except Exception as e:
+                self.logger.error("신청 데이터 기록 실패: %s", e)
+        
+    def record_applications_bulk(self, applications: List[Dict]):
+        """여러 신청 데이터를 기록하고 이벤트 로그에 한 번에 추가합니다."""
+        with self._lock:
+            recorded = []
+            for application_data in applications:
+                try:
+                    self._apply_application(application_data)
+                    recorded.append(application_data)
+                except Exception as e:
+                    self.logger.error("신청 데이터 기록 실패: %s", e)
             
-        except Exception as e:
-            self.logger.error(f"신청 데이터 기록 실패: {e}")
+            try:
+                self._append_events(recorded)
+            except Exception as e:
+                self.logger.error("분석 이벤트 기록 실패: %s", e)
+        
+    def _apply_application(self, application_data: Dict):
+        """신청 데이터 한 건을 통계에 반영합니다 (파일 저장은 호출자가 담당)."""
+        # 재반영 시에도 같은 결과가 나오도록 신청 시각 기준으로 집계
+        applied_at = application_data.get('applied_at')
+        if applied_at:
+            current_time = _parse_applied_at(applied_at)
+        else:
+            current_time = datetime.now(self.settings.tz)
+        month_key = current_time.strftime("%Y-%m")
+        
+        # 월별 통계 업데이트
+        self._update_monthly_stats(month_key, int(current_time.timestamp()), application_data)
+        
+        # 사용자 참여도 업데이트
+        self._update_user_participation(month_key, application_data)
+        
+        # 인기 시간대 업데이트 (시/요일 키는 여기서 한 번만 계산)
+        self._update_popular_times(current_time.strftime("%H"), current_time.strftime("%A"))
+        
+        # 채널 성과 업데이트
+        self._update_channel_performance(application_data)
+        
+        # 트렌드 데이터 업데이트
+        self._update_trends(current_time, application_data)
     
-    def _update_monthly_stats(self, month_key: str, application_data: Dict):
+    def _update_monthly_stats(self, month_key: str, applied_ts: int, application_data: Dict):
         """월별 통계를 업데이트합니다."""
         if month_key not in self.analytics_data['monthly_stats']:
             self.analytics_data['monthly_stats'][month_key] = {
                 'total_applications': 0,
-                'unique_users': set(),
-                'popular_dates': Counter(),
-                'application_times': [],
-                'channels': Counter()
+                'unique_users': {},  # {사용자 ID: True} (JSON에 그대로 저장 가능한 집합)
+                'popular_dates': {},
+                'application_times': [],  # 신청 시각 (Unix 타임스탬프 정수)
+                'channels': {}
             }
         
         stats = self.analytics_data['monthly_stats'][month_key]
         stats['total_applications'] += 1
-        stats['unique_users'].add(application_data['user_id'])
+        stats['unique_users'][str(application_data['user_id'])] = True
         
         # 날짜별 신청 현황
+        popular_dates = stats['popular_dates']
         for date in application_data['requested_dates']:
-            stats['popular_dates'][date] += 1
+            popular_dates[date] = popular_dates.get(date, 0) + 1
         
         # 신청 시간 기록
-        stats['application_times'].append(application_data['applied_at'])
+        stats['application_times'].append(applied_ts)
         
         # 채널별 신청 현황
         if 'channel_id' in application_data:
-            stats['channels'][application_data['channel_id']] += 1
+            channel_id = str(application_data['channel_id'])
+            stats['channels'][channel_id] = stats['channels'].get(channel_id, 0) + 1
     
-    def _update_user_participation(self, application_data: Dict):
+    def _update_user_participation(self, month_key: str, application_data: Dict):
         """사용자 참여도를 업데이트합니다."""
         user_id = str(application_data['user_id'])
         
@@ -119,34 +274,47 @@ class Analytics:
                 'total_applications': 0,
                 'first_application': application_data['applied_at'],
                 'last_application': application_data['applied_at'],
-                'preferred_dates': Counter(),
-                'application_months': set()
+                'preferred_dates': {},
+                'application_months': {}  # {연도: 신청한 월 비트마스크}
             }
         
         user_data = self.analytics_data['user_participation'][user_id]
         user_data['total_applications'] += 1
         user_data['last_application'] = application_data['applied_at']
+        self._track_top_user(user_id, user_data['total_applications'])
         
         # 선호 날짜 기록
+        preferred_dates = user_data['preferred_dates']
         for date in application_data['requested_dates']:
-            user_data['preferred_dates'][date] += 1
+            preferred_dates[date] = preferred_dates.get(date, 0) + 1
         
         # 신청 월 기록
-        current_month = datetime.fromisoformat(application_data['applied_at']).strftime("%Y-%m")
-        user_data['application_months'].add(current_month)
+        application_months = _month_masks(user_data['application_months'])
+        year = month_key[0:4]
+        application_months[year] = application_months.get(year, 0) | _month_bit(month_key)
+        user_data['application_months'] = application_months
     
-    def _update_popular_times(self, current_time: datetime, application_data: Dict):
-        """인기 시간대를 업데이트합니다."""
-        hour_key = current_time.strftime("%H")
-        day_key = current_time.strftime("%A")  # 요일
-        
-        if 'hourly' not in self.analytics_data['popular_times']:
-            self.analytics_data['popular_times']['hourly'] = Counter()
-        if 'daily' not in self.analytics_data['popular_times']:
-            self.analytics_data['popular_times']['daily'] = Counter()
-        
-        self.analytics_data['popular_times']['hourly'][hour_key] += 1
-        self.analytics_data['popular_times']['daily'][day_key] += 1
+    def _track_top_user(self, user_id: str, total_applications: int):
+        """상위 사용자 캐시를 갱신합니다 (신청 수는 늘기만 하므로 방금 늘어난 사용자만 비교)."""
+        top_user_ids = self._top_user_ids
+        if top_user_ids is None or user_id in top_user_ids:
+            return
+        if len(top_user_ids) < self._top_users_k:
+            top_user_ids.append(user_id)
+            return
+        
+        users = self.analytics_data['user_participation']
+        weakest = min(top_user_ids, key=lambda uid: users[uid]['total_applications'])
+        if users[weakest]['total_applications'] < total_applications:
+            top_user_ids[top_user_ids.index(weakest)] = user_id
+    
+    def _update_popular_times(self, hour_key: str, day_key: str):
+        """인기 시간대(시, 요일)를 업데이트합니다."""
+        hourly = self.analytics_data['popular_times'].setdefault('hourly', {})
+        daily = self.analytics_data['popular_times'].setdefault('daily', {})
+        
+        hourly[hour_key] = hourly.get(hour_key, 0) + 1
+        daily[day_key] = daily.get(day_key, 0) + 1
     
     def _update_channel_performance(self, application_data: Dict):
         """채널별 성과를 업데이트합니다."""
@@ -158,14 +326,14 @@ class Analytics:
         if channel_id not in self.analytics_data['channel_performance']:
             self.analytics_data['channel_performance'][channel_id] = {
                 'total_applications': 0,
-                'unique_users': set(),
+                'unique_users': {},
                 'average_participation': 0,
                 'last_activity': application_data['applied_at']
             }
         
         channel_data = self.analytics_data['channel_performance'][channel_id]
         channel_data['total_applications'] += 1
-        channel_data['unique_users'].add(application_data['user_id'])
+        channel_data['unique_users'][str(application_data['user_id'])] = True
         channel_data['last_activity'] = application_data['applied_at']
         
         # 평균 참여도 계산
@@ -178,190 +346,215 @@ class Analytics:
         if week_key not in self.analytics_data['trends']:
             self.analytics_data['trends'][week_key] = {
                 'applications': 0,
-                'unique_users': set(),
+                'unique_users': {},
                 'growth_rate': 0
             }
         
         trend_data = self.analytics_data['trends'][week_key]
         trend_data['applications'] += 1
-        trend_data['unique_users'].add(application_data['user_id'])
+        trend_data['unique_users'][str(application_data['user_id'])] = True
     
     def get_monthly_statistics(self, month: str = None) -> Dict:
         """월별 통계를 반환합니다."""
-        if month is None:
-            month = datetime.now(pytz.timezone(self.settings.timezone)).strftime("%Y-%m")
-        
-        if month not in self.analytics_data['monthly_stats']:
-            return {'error': '해당 월의 데이터가 없습니다.'}
-        
-        stats = self.analytics_data['monthly_stats'][month]
-        
-        # set을 list로 변환 (JSON 직렬화를 위해)
-        return {
-            'month': month,
-            'total_applications': stats['total_applications'],
-            'unique_users': len(stats['unique_users']),
-            'popular_dates': dict(stats['popular_dates'].most_common(10)),
-            'top_channels': dict(stats['channels'].most_common(5)),
-            'application_times': len(stats['application_times'])
-        }
-    
-    def get_user_participation_stats(self, user_id: int = None) -> Dict:
-        """사용자 참여도 통계를 반환합니다."""
-        if user_id is None:
-            # 전체 사용자 통계
-            total_users = len(self.analytics_data['user_participation'])
-            if total_users == 0:
-                return {'error': '사용자 데이터가 없습니다.'}
+        with self._lock:
+            if month is None:
+                month = datetime.now(self.settings.tz).strftime("%Y-%m")
             
-            all_applications = [user_data['total_applications'] 
-                              for user_data in self.analytics_data['user_participation'].values()]
+            if month not in self.analytics_data['monthly_stats']:
+                return {'error': '해당 월의 데이터가 없습니다.'}
             
-            return {
-                'total_users': total_users,
-                'average_applications': sum(all_applications) / len(all_applications),
-                'most_active_users': self._get_most_active_users(5),
-                'participation_distribution': self._get_participation_distribution()
-            }
-        else:
-            # 특정 사용자 통계
-            user_id_str = str(user_id)
-            if user_id_str not in self.analytics_data['user_participation']:
-                return {'error': '해당 사용자의 데이터가 없습니다.'}
-            
-            user_data = self.analytics_data['user_participation'][user_id_str]
+            stats = self.analytics_data['monthly_stats'][month]
             
             return {
-                'user_id': user_id,
-                'total_applications': user_data['total_applications'],
-                'first_application': user_data['first_application'],
-                'last_application': user_data['last_application'],
-                'preferred_dates': dict(user_data['preferred_dates'].most_common(5)),
-                'application_months': len(user_data['application_months'])
+                'month': month,
+                'total_applications': stats['total_applications'],
+                'unique_users': len(stats['unique_users']),
+                'popular_dates': _top_counts(stats['popular_dates'], 10),
+                'top_channels': _top_counts(stats['channels'], 5),
+                'application_times': len(stats['application_times'])
             }
-    
+        
+    def get_user_participation_stats(self, user_id: int = None) -> Dict:
+        """사용자 참여도 통계를 반환합니다."""
+        with self._lock:
+            if user_id is None:
+                # 전체 사용자 통계
+                total_users = len(self.analytics_data['user_participation'])
+                if total_users == 0:
+                    return {'error': '사용자 데이터가 없습니다.'}
+                
+                total_applications, distribution = self._summarize_participation()
+                
+                return {
+                    'total_users': total_users,
+                    'average_applications': total_applications / total_users,
+                    'most_active_users': self._get_most_active_users(5),
+                    'participation_distribution': distribution
+                }
+            else:
+                # 특정 사용자 통계
+                user_id_str = str(user_id)
+                if user_id_str not in self.analytics_data['user_participation']:
+                    return {'error': '해당 사용자의 데이터가 없습니다.'}
+                
+                user_data = self.analytics_data['user_participation'][user_id_str]
+                
+                return {
+                    'user_id': user_id,
+                    'total_applications': user_data['total_applications'],
+                    'first_application': user_data['first_application'],
+                    'last_application': user_data['last_application'],
+                    'preferred_dates': _top_counts(user_data['preferred_dates'], 5),
+                    'application_months': sum(mask.bit_count() for mask in _month_masks(user_data['application_months']).values())
+                }
+        
     def get_popular_times_analysis(self) -> Dict:
         """인기 시간대 분석을 반환합니다."""
-        hourly_data = self.analytics_data['popular_times'].get('hourly', Counter())
-        daily_data = self.analytics_data['popular_times'].get('daily', Counter())
-        
-        return {
-            'peak_hours': dict(hourly_data.most_common(5)),
-            'peak_days': dict(daily_data.most_common(7)),
-            'hourly_distribution': dict(hourly_data),
-            'daily_distribution': dict(daily_data)
-        }
-    
+        with self._lock:
+            hourly_data = self.analytics_data['popular_times'].get('hourly', {})
+            daily_data = self.analytics_data['popular_times'].get('daily', {})
+            
+            return {
+                'peak_hours': _top_counts(hourly_data, 5),
+                'peak_days': _top_counts(daily_data, 7),
+                'hourly_distribution': dict(hourly_data),
+                'daily_distribution': dict(daily_data)
+            }
+        
     def get_channel_performance_analysis(self) -> Dict:
         """채널별 성과 분석을 반환합니다."""
-        channel_data = self.analytics_data['channel_performance']
-        
-        if not channel_data:
-            return {'error': '채널 데이터가 없습니다.'}
-        
-        # 채널별 성과 정렬
-        sorted_channels = sorted(
-            channel_data.items(),
-            key=lambda x: x[1]['total_applications'],
-            reverse=True
-        )
-        
-        return {
-            'top_channels': [
-                {
-                    'channel_id': channel_id,
-                    'total_applications': data['total_applications'],
-                    'unique_users': len(data['unique_users']),
-                    'average_participation': data['average_participation'],
-                    'last_activity': data['last_activity']
-                }
-                for channel_id, data in sorted_channels[:10]
-            ],
-            'total_channels': len(channel_data),
-            'average_applications_per_channel': sum(
-                data['total_applications'] for data in channel_data.values()
-            ) / len(channel_data)
-        }
-    
+        with self._lock:
+            channel_data = self.analytics_data['channel_performance']
+            
+            if not channel_data:
+                return {'error': '채널 데이터가 없습니다.'}
+            
+            # 전체 정렬 없이 상위 10개 채널만 선택
+            top_channels = nlargest(
+                10,
+                channel_data.items(),
+                key=lambda x: x[1]['total_applications']
+            )
+            
+            return {
+                'top_channels': [
+                    {
+                        'channel_id': channel_id,
+                        'total_applications': data['total_applications'],
+                        'unique_users': len(data['unique_users']),
+                        'average_participation': data['average_participation'],
+                        'last_activity': data['last_activity']
+                    }
+                    for channel_id, data in top_channels
+                ],
+                'total_channels': len(channel_data),
+                'average_applications_per_channel': sum(
+                    data['total_applications'] for data in channel_data.values()
+                ) / len(channel_data)
+            }
+        
     def get_trend_analysis(self, weeks: int = 8) -> Dict:
         """트렌드 분석을 반환합니다."""
-        current_time = datetime.now(pytz.timezone(self.settings.timezone))
-        trends = []
-        
-        for i in range(weeks):
-            week_date = current_time - timedelta(weeks=i)
-            week_key = week_date.strftime("%Y-W%W")
+        with self._lock:
+            current_time = datetime.now(self.settings.tz)
+            trend_store = self.analytics_data['trends']
+            trends = []
+            total_applications = 0
             
-            if week_key in self.analytics_data['trends']:
-                trend_data = self.analytics_data['trends'][week_key]
-                trends.append({
-                    'week': week_key,
-                    'applications': trend_data['applications'],
-                    'unique_users': len(trend_data['unique_users'])
-                })
-        
-        if not trends:
-            return {'error': '트렌드 데이터가 없습니다.'}
-        
-        # 성장률 계산
-        if len(trends) > 1:
-            current_week = trends[0]['applications']
-            previous_week = trends[1]['applications']
-            growth_rate = ((current_week - previous_week) / previous_week * 100) if previous_week > 0 else 0
-        else:
-            growth_rate = 0
+            # 주별 데이터 수집과 합계 계산을 한 번의 순회로 처리
+            for i in range(weeks):
+                week_date = current_time - timedelta(weeks=i)
+                week_key = week_date.strftime("%Y-W%W")
+                
+                trend_data = trend_store.get(week_key)
+                if trend_data is not None:
+                    applications = trend_data['applications']
+                    total_applications += applications
+                    trends.append({
+                        'week': week_key,
+                        'applications': applications,
+                        'unique_users': len(trend_data['unique_users'])
+                    })
+            
+            if not trends:
+                return {'error': '트렌드 데이터가 없습니다.'}
+            
+            # 성장률 계산
+            if len(trends) > 1:
+                current_week = trends[0]['applications']
+                previous_week = trends[1]['applications']
+                growth_rate = ((current_week - previous_week) / previous_week * 100) if previous_week > 0 else 0
+            else:
+                growth_rate = 0
+            
+            return {
+                'recent_trends': trends,
+                'growth_rate': round(growth_rate, 2),
+                'average_applications_per_week': total_applications / len(trends)
+            }
         
-        return {
-            'recent_trends': trends,
-            'growth_rate': round(growth_rate, 2),
-            'average_applications_per_week': sum(t['applications'] for t in trends) / len(trends)
-        }
-    
     def _get_most_active_users(self, limit: int = 5) -> List[Dict]:
         """가장 활발한 사용자 목록을 반환합니다."""
-        sorted_users = sorted(
-            self.analytics_data['user_participation'].items(),
-            key=lambda x: x[1]['total_applications'],
-            reverse=True
-        )
+        users = self.analytics_data['user_participation']
+        
+        # 캐시가 없거나 더 많은 인원을 요청하면 전체에서 상위 limit명을 다시 선택
+        if self._top_user_ids is None or limit > self._top_users_k:
+            self._top_users_k = limit
+            self._top_user_ids = [
+                user_id for user_id, _ in nlargest(limit, users.items(), key=lambda x: x[1]['total_applications'])
+            ]
+        
+        # 캐시된 소수의 사용자만 정렬
+        top_user_ids = sorted(self._top_user_ids, key=lambda uid: users[uid]['total_applications'], reverse=True)
         
         return [
             {
                 'user_id': user_id,
-                'total_applications': user_data['total_applications'],
-                'last_application': user_data['last_application']
+                'total_applications': users[user_id]['total_applications'],
+                'last_application': users[user_id]['last_application']
             }
-            for user_id, user_data in sorted_users[:limit]
+            for user_id in top_user_ids[:limit]
         ]
     
-    def _get_participation_distribution(self) -> Dict:
-        """참여도 분포를 반환합니다."""
-        applications_count = [user_data['total_applications'] 
-                            for user_data in self.analytics_data['user_participation'].values()]
-        
-        if not applications_count:
-            return {}
-        
-        return {
-            'low_participation': len([c for c in applications_count if c <= 1]),
-            'medium_participation': len([c for c in applications_count if 2 <= c <= 5]),
-            'high_participation': len([c for c in applications_count if c > 5])
+    def _summarize_participation(self) -> Tuple[int, Dict]:
+        """사용자 목록을 한 번만 순회해 총 신청 수와 참여도 분포를 함께 계산합니다."""
+        total = low = medium = high = 0
+        for user_data in self.analytics_data['user_participation'].values():
+            count = user_data['total_applications']
+            total += count
+            if count <= 1:
+                low += 1
+            elif count <= 5:
+                medium += 1
+            else:
+                high += 1
+        
+        if not (low or medium or high):
+            return 0, {}
+        
+        return total, {
+            'low_participation': low,
+            'medium_participation': medium,
+            'high_participation': high
         }
+
     
     def generate_comprehensive_report(self) -> Dict:
         """종합 분석 보고서를 생성합니다."""
-        current_month = datetime.now(pytz.timezone(self.settings.timezone)).strftime("%Y-%m")
-        
-        return {
-            'report_generated_at': datetime.now(pytz.timezone(self.settings.timezone)).isoformat(),
-            'monthly_stats': self.get_monthly_statistics(current_month),
-            'user_participation': self.get_user_participation_stats(),
-            'popular_times': self.get_popular_times_analysis(),
-            'channel_performance': self.get_channel_performance_analysis(),
-            'trends': self.get_trend_analysis(),
-            'insights': self._generate_insights()
-        }
-    
+        with self._lock:
+            current_time = datetime.now(self.settings.tz)
+            current_month = current_time.strftime("%Y-%m")
+            
+            return {
+                'report_generated_at': current_time.isoformat(),
+                'monthly_stats': self.get_monthly_statistics(current_month),
+                'user_participation': self.get_user_participation_stats(),
+                'popular_times': self.get_popular_times_analysis(),
+                'channel_performance': self.get_channel_performance_analysis(),
+                'trends': self.get_trend_analysis(),
+                'insights': self._generate_insights()
+            }
+        
     def _generate_insights(self) -> List[str]:
         """데이터 기반 인사이트를 생성합니다."""
         insights = []
@@ -394,36 +587,22 @@ class Analytics:
     
     def cleanup_old_data(self, months_to_keep: int = 12):
         """오래된 데이터를 정리합니다."""
-        current_time = datetime.now(pytz.timezone(self.settings.timezone))
-        cutoff_date = current_time - timedelta(days=months_to_keep * 30)
-        
-        # 월별 통계 정리
-        months_to_remove = []
-        for month_key in self.analytics_data['monthly_stats']:
-            try:
-                month_date = datetime.strptime(month_key, "%Y-%m")
-                if month_date < cutoff_date:
-                    months_to_remove.append(month_key)
-            except ValueError:
-                continue
-        
-        for month in months_to_remove:
-            del self.analytics_data['monthly_stats'][month]
-        
-        # 트렌드 데이터 정리
-        weeks_to_remove = []
-        for week_key in self.analytics_data['trends']:
-            try:
-                year, week = week_key.split('-W')
-                week_date = datetime.strptime(f"{year}-W{week}-1", "%Y-W%W-%w")
-                if week_date < cutoff_date:
-                    weeks_to_remove.append(week_key)
-            except ValueError:
-                continue
-        
-        for week in weeks_to_remove:
-            del self.analytics_data['trends'][week]
-        
-        if months_to_remove or weeks_to_remove:
-            self._save_data()
-            self.logger.info(f"오래된 분석 데이터 정리 완료: {len(months_to_remove)}개월, {len(weeks_to_remove)}주") 
\ No newline at end of file
+        with self._lock:
+            cutoff_date = datetime.now(self.settings.tz) - timedelta(days=months_to_keep * 30)
+            # 'YYYY-MM', 'YYYY-W%W' 키는 0으로 채워져 있어 문자열 비교가 곧 날짜 순서
+            cutoff_month = cutoff_date.strftime("%Y-%m")
+            cutoff_week = cutoff_date.strftime("%Y-W%W")
+            
+            # 월별 통계 정리
+            months_to_remove = [k for k in self.analytics_data['monthly_stats'] if k < cutoff_month]
+            for month in months_to_remove:
+                del self.analytics_data['monthly_stats'][month]
+            
+            # 트렌드 데이터 정리
+            weeks_to_remove = [k for k in self.analytics_data['trends'] if k < cutoff_week]
+            for week in weeks_to_remove:
+                del self.analytics_data['trends'][week]
+            
+            if months_to_remove or weeks_to_remove:
+                self._save_data()
+                self.logger.info("오래된 분석 데이터 정리 완료: %s개월, %s주", len(months_to_remove), len(weeks_to_remove)) 
\ No newline at end of file
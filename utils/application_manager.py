@@ -2,15 +2,19 @@
 스케줄 신청 현황 관리 시스템.
 """
 
-import json
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
-import pytz
+from typing import Callable, Dict, List, Optional, Set
+
+from utils.storage import load_json_file, dump_json, write_bytes_atomic
 
 class ApplicationManager:
     """스케줄 신청 현황을 관리합니다."""
     
+    SAVE_DEBOUNCE_SECONDS = 1.0  # 연속된 변경을 한 번의 파일 쓰기로 모으는 시간
+    
     def __init__(self, settings, data_file: str = "config/applications.json"):
         """신청 관리자를 초기화합니다."""
         self.settings = settings
@@ -21,96 +25,190 @@ class ApplicationManager:
         self.applications = {}  # {message_id: {applications: [], deadline: str, channel_id: int}}
         self.user_applications = {}  # {user_id: {message_id: str, applied_date: str}}
         
+        # 데이터 변경/저장 동기화 (신청 기록은 별도 스레드에서도 들어옴)
+        self._lock = threading.RLock()
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._session_listeners = []  # 세션이 생성/마감/정리될 때 호출할 콜백
+        
         # 데이터 로드
         self._load_data()
+        
+        # 변경 사항을 모아서 기록하는 백그라운드 저장 스레드
+        self._writer = threading.Thread(target=self._writer_loop, name="application-writer", daemon=True)
+        self._writer.start()
     
     def _load_data(self):
         """신청 데이터를 파일에서 로드합니다."""
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.applications = data.get('applications', {})
-                self.user_applications = data.get('user_applications', {})
+            data = load_json_file(self.data_file)
+            self.applications = data.get('applications', {})
+            self.user_applications = data.get('user_applications', {})
+            # 이전 형식 데이터에는 마감/생성 타임스탬프와 집계값이 없으므로 보충
+            for session in self.applications.values():
+                if 'deadline_ts' not in session:
+                    session['deadline_ts'] = int(datetime.fromisoformat(session['deadline']).timestamp())
+                if 'created_ts' not in session:
+                    session['created_ts'] = int(datetime.fromisoformat(session['created_at']).timestamp())
+                if 'date_counts' not in session:
+                    self._rebuild_session_aggregates(session)
             self.logger.info("신청 데이터 로드 완료")
         except FileNotFoundError:
             self.logger.info("신청 데이터 파일이 없습니다. 새로 생성합니다.")
             self._save_data()
         except Exception as e:
-            self.logger.error(f"신청 데이터 로드 실패: {e}")
+            self.logger.error("신청 데이터 로드 실패: %s", e)
             self.applications = {}
             self.user_applications = {}
     
+    def _rebuild_session_aggregates(self, session: Dict):
+        """세션의 신청 목록으로 날짜별 신청 수와 신청자 집계를 다시 만듭니다."""
+        session['date_counts'] = {}
+        session['applicant_ids'] = {}
+        for app in session['applications']:
+            self._count_application(session, app)
+    
+    def _count_application(self, session: Dict, application: Dict):
+        """신청 한 건을 세션 집계에 반영합니다."""
+        date_counts = session['date_counts']
+        for date in application['requested_dates']:
+            date_counts[date] = date_counts.get(date, 0) + 1
+        session['applicant_ids'][str(application['user_id'])] = True
+    
     def _save_data(self):
+        """저장을 예약합니다 (백그라운드 스레드가 잠시 모았다가 한 번에 기록)."""
+        self._dirty.set()
+    
+    def _writer_loop(self):
+        """저장 요청이 오면 잠시 기다려 변경을 모은 뒤 파일에 기록합니다."""
+        while True:
+            self._dirty.wait()
+            # 종료 요청이 오면 기다리지 않고 바로 기록
+            self._stop.wait(self.SAVE_DEBOUNCE_SECONDS)
+            self._dirty.clear()
+            self._write_data()
+            # 기록하는 사이에 들어온 변경이 있으면 종료 전에 한 번 더 기록
+            if self._stop.is_set() and not self._dirty.is_set():
+                return
+    
+    def _write_data(self):
         """신청 데이터를 파일에 저장합니다."""
         try:
-            data = {
-                'applications': self.applications,
-                'user_applications': self.user_applications
-            }
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # 직렬화는 잠금 안에서, 파일 쓰기는 잠금 밖에서 처리
+            with self._lock:
+                payload = dump_json({
+                    'applications': self.applications,
+                    'user_applications': self.user_applications
+                })
+            write_bytes_atomic(self.data_file, payload)
             self.logger.debug("신청 데이터 저장 완료")
         except Exception as e:
-            self.logger.error(f"신청 데이터 저장 실패: {e}")
+            self.logger.error("신청 데이터 저장 실패: %s", e)
+    
+    def close(self):
+        """백그라운드 저장을 멈추고 남은 변경 사항을 기록합니다."""
+        self._stop.set()
+        self._dirty.set()
+        self._writer.join()
+        # 저장 스레드가 끝난 뒤 들어온 변경도 잃지 않도록 직접 기록
+        with self._lock:
+            if self._dirty.is_set():
+                self._dirty.clear()
+                self._write_data()
+    
+    def add_session_listener(self, callback: Callable[[], None]):
+        """세션이 생성되거나 마감·정리될 때 호출할 콜백을 등록합니다."""
+        self._session_listeners.append(callback)
+    
+    def _notify_session_listeners(self):
+        """등록된 세션 변경 콜백을 호출합니다."""
+        for callback in self._session_listeners:
+            try:
+                callback()
+            except Exception as e:
+                self.logger.error("세션 변경 콜백 실행 실패: %s", e)
     
     def create_application_session(self, message_id: str, channel_id: int, deadline_days: int = 5):
         """새로운 신청 세션을 생성합니다."""
-        deadline = datetime.now(pytz.timezone(self.settings.timezone)) + timedelta(days=deadline_days)
-        
-        self.applications[message_id] = {
-            'applications': [],
-            'deadline': deadline.isoformat(),
-            'channel_id': channel_id,
-            'created_at': datetime.now(pytz.timezone(self.settings.timezone)).isoformat(),
-            'status': 'active'
-        }
+        with self._lock:
+            now = datetime.now(self.settings.tz)
+            deadline = now + timedelta(days=deadline_days)
+            
+            self.applications[message_id] = {
+                'applications': [],
+                'date_counts': {},  # {날짜: 신청 수}
+                'applicant_ids': {},  # {사용자 ID: True}
+                'deadline': deadline.isoformat(),
+                'deadline_ts': int(deadline.timestamp()),
+                'channel_id': channel_id,
+                'created_at': now.isoformat(),
+                'created_ts': int(now.timestamp()),
+                'status': 'active'
+            }
+            
+            self._save_data()
+            self.logger.info("신청 세션 생성: 메시지 ID %s, 마감일 %s", message_id, deadline.strftime('%Y-%m-%d %H:%M'))
         
-        self._save_data()
-        self.logger.info(f"신청 세션 생성: 메시지 ID {message_id}, 마감일 {deadline.strftime('%Y-%m-%d %H:%M')}")
+        self._notify_session_listeners()
     
     def add_application(self, message_id: str, user_id: int, user_name: str, 
                        requested_dates: List[str], additional_info: str = "") -> Dict:
         """신청을 추가합니다."""
-        if message_id not in self.applications:
-            return {'success': False, 'error': '유효하지 않은 신청 세션입니다.'}
-        
-        # 마감일 확인
-        deadline = datetime.fromisoformat(self.applications[message_id]['deadline'])
-        if datetime.now(pytz.timezone(self.settings.timezone)) > deadline:
-            return {'success': False, 'error': '신청 기간이 마감되었습니다.'}
-        
-        # 중복 신청 확인
-        if str(user_id) in self.user_applications:
-            existing = self.user_applications[str(user_id)]
-            if existing.get('message_id') == message_id:
-                return {'success': False, 'error': '이미 신청하셨습니다.'}
-        
-        # 신청 추가
-        application = {
-            'user_id': user_id,
-            'user_name': user_name,
-            'requested_dates': requested_dates,
-            'additional_info': additional_info,
-            'applied_at': datetime.now(pytz.timezone(self.settings.timezone)).isoformat()
-        }
-        
-        self.applications[message_id]['applications'].append(application)
-        
-        # 사용자 신청 기록
-        self.user_applications[str(user_id)] = {
-            'message_id': message_id,
-            'applied_date': application['applied_at']
-        }
-        
-        self._save_data()
-        
-        self.logger.info(f"신청 추가: 사용자 {user_name} ({user_id}), 메시지 {message_id}")
-        
-        return {
-            'success': True,
-            'application': application,
-            'total_applications': len(self.applications[message_id]['applications'])
-        }
+        result = self._append_application(message_id, user_id, user_name, requested_dates, additional_info)
+        if result['success']:
+            self._save_data()
+        return result
+    
+    def add_applications_bulk(self, entries: List[Dict]) -> List[Dict]:
+        """여러 신청을 한 번에 추가하고 파일은 한 번만 저장합니다."""
+        results = [self._append_application(**entry) for entry in entries]
+        if any(result['success'] for result in results):
+            self._save_data()
+        return results
+    
+    def _append_application(self, message_id: str, user_id: int, user_name: str,
+                            requested_dates: List[str], additional_info: str = "") -> Dict:
+        """신청을 메모리에 추가합니다 (파일 저장은 호출자가 담당)."""
+        with self._lock:
+            if message_id not in self.applications:
+                return {'success': False, 'error': '유효하지 않은 신청 세션입니다.'}
+            
+            # 마감일 확인 (저장해 둔 타임스탬프와 비교)
+            if time.time() > self.applications[message_id]['deadline_ts']:
+                return {'success': False, 'error': '신청 기간이 마감되었습니다.'}
+            
+            # 중복 신청 확인
+            if str(user_id) in self.user_applications:
+                existing = self.user_applications[str(user_id)]
+                if existing.get('message_id') == message_id:
+                    return {'success': False, 'error': '이미 신청하셨습니다.'}
+            
+            # 신청 추가
+            application = {
+                'user_id': user_id,
+                'user_name': user_name,
+                'requested_dates': requested_dates,
+                'additional_info': additional_info,
+                'applied_at': datetime.now(self.settings.tz).isoformat()
+            }
+            
+            session = self.applications[message_id]
+            session['applications'].append(application)
+            self._count_application(session, application)
+            
+            # 사용자 신청 기록
+            self.user_applications[str(user_id)] = {
+                'message_id': message_id,
+                'applied_date': application['applied_at']
+            }
+            
+            self.logger.info("신청 추가: 사용자 %s (%s), 메시지 %s", user_name, user_id, message_id)
+            
+            return {
+                'success': True,
+                'application': application,
+                'total_applications': len(self.applications[message_id]['applications'])
+            }
     
     def get_applications_summary(self, message_id: str) -> Dict:
         """신청 현황 요약을 반환합니다."""
@@ -120,18 +218,15 @@ class ApplicationManager:
         session = self.applications[message_id]
         applications = session['applications']
         
-        # 날짜별 신청 현황
-        date_counts = {}
-        for app in applications:
-            for date in app['requested_dates']:
-                date_counts[date] = date_counts.get(date, 0) + 1
+        # 날짜별 신청 현황 (신청 추가 시 갱신해 둔 집계 사용)
+        date_counts = dict(session['date_counts'])
         
         # 중복 신청이 많은 날짜
         popular_dates = [date for date, count in date_counts.items() if count > 1]
         
         return {
             'total_applications': len(applications),
-            'unique_applicants': len(set(app['user_id'] for app in applications)),
+            'unique_applicants': len(session['applicant_ids']),
             'date_counts': date_counts,
             'popular_dates': popular_dates,
             'deadline': session['deadline'],
@@ -140,17 +235,19 @@ class ApplicationManager:
     
     def close_application_session(self, message_id: str) -> Dict:
         """신청 세션을 마감합니다."""
-        if message_id not in self.applications:
-            return {'success': False, 'error': '유효하지 않은 신청 세션입니다.'}
-        
-        self.applications[message_id]['status'] = 'closed'
-        self.applications[message_id]['closed_at'] = datetime.now(pytz.timezone(self.settings.timezone)).isoformat()
-        
-        self._save_data()
-        
-        summary = self.get_applications_summary(message_id)
-        self.logger.info(f"신청 세션 마감: 메시지 ID {message_id}, 총 신청 {summary['total_applications']}건")
+        with self._lock:
+            if message_id not in self.applications:
+                return {'success': False, 'error': '유효하지 않은 신청 세션입니다.'}
+            
+            self.applications[message_id]['status'] = 'closed'
+            self.applications[message_id]['closed_at'] = datetime.now(self.settings.tz).isoformat()
+            
+            self._save_data()
+            
+            summary = self.get_applications_summary(message_id)
+            self.logger.info("신청 세션 마감: 메시지 ID %s, 총 신청 %s건", message_id, summary['total_applications'])
         
+        self._notify_session_listeners()
         return {'success': True, 'summary': summary}
     
     def get_user_application(self, user_id: int) -> Optional[Dict]:
@@ -177,42 +274,69 @@ class ApplicationManager:
     
     def cleanup_old_sessions(self, days: int = 30):
         """오래된 신청 세션을 정리합니다."""
-        cutoff_date = datetime.now(pytz.timezone(self.settings.timezone)) - timedelta(days=days)
-        
-        to_remove = []
-        for message_id, session in self.applications.items():
-            created_at = datetime.fromisoformat(session['created_at'])
-            if created_at < cutoff_date:
-                to_remove.append(message_id)
-        
-        for message_id in to_remove:
-            del self.applications[message_id]
-        
-        # 사용자 신청 기록도 정리
-        to_remove_users = []
-        for user_id, user_app in self.user_applications.items():
-            if user_app['message_id'] in to_remove:
-                to_remove_users.append(user_id)
-        
-        for user_id in to_remove_users:
-            del self.user_applications[user_id]
+        with self._lock:
+            # 저장해 둔 생성 타임스탬프와 비교 (세션마다 날짜 문자열을 파싱하지 않음)
+            cutoff_ts = time.time() - days * 86400
+            
+            to_remove = [
+                message_id for message_id, session in self.applications.items()
+                if session['created_ts'] < cutoff_ts
+            ]
+            
+            for message_id in to_remove:
+                del self.applications[message_id]
+            
+            # 사용자 신청 기록도 정리
+            removed_ids = set(to_remove)
+            to_remove_users = []
+            for user_id, user_app in self.user_applications.items():
+                if user_app['message_id'] in removed_ids:
+                    to_remove_users.append(user_id)
+            
+            for user_id in to_remove_users:
+                del self.user_applications[user_id]
+            
+            if to_remove:
+                self._save_data()
+                self.logger.info("오래된 신청 세션 %s개 정리 완료", len(to_remove))
         
         if to_remove:
-            self._save_data()
-            self.logger.info(f"오래된 신청 세션 {len(to_remove)}개 정리 완료")
+            self._notify_session_listeners()
     
     def get_active_sessions(self) -> List[Dict]:
         """활성 신청 세션 목록을 반환합니다."""
-        active_sessions = []
-        for message_id, session in self.applications.items():
-            if session.get('status') == 'active':
-                summary = self.get_applications_summary(message_id)
-                active_sessions.append({
-                    'message_id': message_id,
-                    'channel_id': session['channel_id'],
-                    'created_at': session['created_at'],
-                    'deadline': session['deadline'],
-                    'summary': summary
-                })
-        
-        return active_sessions 
\ No newline at end of file
+        with self._lock:
+            active_sessions = []
+            for message_id, session in self.applications.items():
+                if session.get('status') == 'active':
+                    active_sessions.append(self._session_info(message_id, session))
+            
+            return active_sessions
+    
+    def get_active_session(self, message_id: str) -> Optional[Dict]:
+        """활성 신청 세션 하나를 반환합니다 (없거나 마감됐으면 None)."""
+        with self._lock:
+            session = self.applications.get(message_id)
+            if session is None or session.get('status') != 'active':
+                return None
+            return self._session_info(message_id, session)
+    
+    def get_active_deadlines(self) -> List[tuple]:
+        """활성 세션의 (메시지 ID, 마감 타임스탬프) 목록을 반환합니다 (요약은 만들지 않음)."""
+        with self._lock:
+            return [
+                (message_id, session['deadline_ts'])
+                for message_id, session in self.applications.items()
+                if session.get('status') == 'active'
+            ]
+    
+    def _session_info(self, message_id: str, session: Dict) -> Dict:
+        """세션 정보와 신청 현황 요약을 묶어 반환합니다."""
+        return {
+            'message_id': message_id,
+            'channel_id': session['channel_id'],
+            'created_at': session['created_at'],
+            'deadline': session['deadline'],
+            'deadline_ts': session['deadline_ts'],
+            'summary': self.get_applications_summary(message_id)
+        } 
\ No newline at end of file
@@ -2,10 +2,19 @@
 디스코드 봇용 로깅 구성.
 """
 
+import asyncio
+import atexit
+import functools
 import logging
+import queue
 import sys
 from datetime import datetime
 import os
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from discord.ext import commands
+
+_queue_listener = None  # 큐에 쌓인 로그를 백그라운드 스레드에서 실제 핸들러로 기록
 
 def setup_logger(log_level: str = "INFO", log_file: str = "") -> logging.Logger:
     """
@@ -34,26 +43,41 @@ def setup_logger(log_level: str = "INFO", log_file: str = "") -> logging.Logger:
     
     # 기존 핸들러 모두 제거
     logger.handlers.clear()
+    stop_logger()
     
     # 콘솔 핸들러
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
-    # 파일 핸들러 (선택사항)
+    # 파일 핸들러 (선택사항, 크기 제한으로 디스크 사용량 제한)
+    file_handler_error = None
     if log_file:
         try:
             # 로그 디렉토리가 없으면 생성
             os.makedirs(os.path.dirname(log_file), exist_ok=True)
             
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler = RotatingFileHandler(
+                log_file, maxBytes=50 * 1024 * 1024, backupCount=5, encoding='utf-8'
+            )
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
-            
-            logger.info(f"파일에 로깅: {log_file}")
+            handlers.append(file_handler)
             
         except Exception as e:
-            logger.error(f"파일 핸들러 생성 실패: {e}")
+            file_handler_error = e
+    
+    # 로그 호출은 큐에 넣기만 하고, 콘솔/파일 출력은 백그라운드 리스너가 처리
+    global _queue_listener
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _queue_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _queue_listener.start()
+    atexit.register(stop_logger)
+    
+    if file_handler_error is not None:
+        logger.error("파일 핸들러 생성 실패: %s", file_handler_error)
+    elif log_file:
+        logger.info("파일에 로깅: %s", log_file)
     
     # 일부 라이브러리의 노이즈 줄이기
     logging.getLogger('discord').setLevel(logging.WARNING)
@@ -63,60 +87,94 @@ def setup_logger(log_level: str = "INFO", log_file: str = "") -> logging.Logger:
     logger.info("로깅 시스템 초기화됨")
     return logger
 
+def stop_logger():
+    """백그라운드 로그 리스너를 멈추고 남은 로그를 모두 기록합니다."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
 class BotLogger:
     """구조화된 로깅을 위한 컨텍스트 매니저."""
     
+    _context_formats = {}  # {컨텍스트 키 순서: " | k1=%s | k2=%s"} 형식 문자열 캐시
+    
     def __init__(self, logger_name: str):
         self.logger = logging.getLogger(logger_name)
     
     def info(self, message: str, **kwargs):
         """선택적 컨텍스트와 함께 정보 메시지를 로깅합니다."""
-        context = self._format_context(kwargs)
-        self.logger.info(f"{message}{context}")
+        self._log(logging.INFO, message, kwargs)
     
     def error(self, message: str, **kwargs):
         """선택적 컨텍스트와 함께 오류 메시지를 로깅합니다."""
-        context = self._format_context(kwargs)
-        self.logger.error(f"{message}{context}")
+        self._log(logging.ERROR, message, kwargs)
     
     def warning(self, message: str, **kwargs):
         """선택적 컨텍스트와 함께 경고 메시지를 로깅합니다."""
-        context = self._format_context(kwargs)
-        self.logger.warning(f"{message}{context}")
+        self._log(logging.WARNING, message, kwargs)
     
     def debug(self, message: str, **kwargs):
         """선택적 컨텍스트와 함께 디버그 메시지를 로깅합니다."""
-        context = self._format_context(kwargs)
-        self.logger.debug(f"{message}{context}")
+        self._log(logging.DEBUG, message, kwargs)
+    
+    def _log(self, level: int, message: str, context: dict):
+        """레벨이 활성화된 경우에만 컨텍스트를 붙여 로깅합니다 (포맷은 로깅 시점까지 지연)."""
+        if not self.logger.isEnabledFor(level):
+            return
+        self.logger.log(level, "%s" + self._format_context(context), message, *context.values())
     
     def _format_context(self, context: dict) -> str:
-        """로깅을 위해 컨텍스트 딕셔너리를 포맷합니다."""
+        """컨텍스트 키 구성에 맞는 형식 문자열을 반환합니다 (키 순서별로 한 번만 생성)."""
         if not context:
             return ""
         
-        context_str = " | ".join([f"{k}={v}" for k, v in context.items()])
-        return f" | {context_str}"
+        keys = tuple(context)
+        context_format = self._context_formats.get(keys)
+        if context_format is None:
+            # 키 이름에 들어 있는 %는 형식 지정자로 해석되지 않도록 이스케이프
+            context_format = "".join(f" | {k.replace('%', '%%')}=%s" for k in keys)
+            self._context_formats[keys] = context_format
+        return context_format
+
+def _find_context(args):
+    """명령어 인자에서 Context를 찾습니다 (cog 메서드는 self 다음, 함수는 첫 번째 인자)."""
+    for arg in args[:2]:
+        if isinstance(arg, commands.Context):
+            return arg
+    return None
+
+def _log_context(logger: logging.Logger, ctx):
+    """명령어 사용 정보를 로깅합니다."""
+    logger.info(
+        "명령어 사용됨: %s | 사용자: %s | 길드: %s | 채널: #%s",
+        ctx.command.name,
+        ctx.author,
+        ctx.guild.name if ctx.guild else 'DM',
+        getattr(ctx.channel, 'name', 'DM')
+    )
 
 def log_command_usage(func):
-    """명령어 사용을 로깅하는 데코레이터."""
-    def wrapper(*args, **kwargs):
-        logger = logging.getLogger(__name__)
-        
-        # 컨텍스트 정보 추출 시도
-        ctx = None
-        for arg in args:
-            if hasattr(arg, 'author') and hasattr(arg, 'command'):
-                ctx = arg
-                break
-        
-        if ctx:
-            logger.info(
-                f"명령어 사용됨: {ctx.command.name} | "
-                f"사용자: {ctx.author} | "
-                f"길드: {ctx.guild.name if ctx.guild else 'DM'} | "
-                f"채널: #{ctx.channel.name if hasattr(ctx.channel, 'name') else 'DM'}"
-            )
+    """명령어 사용을 로깅하는 데코레이터 (코루틴 명령어도 지원)."""
+    logger = logging.getLogger(__name__)
+    
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if logger.isEnabledFor(logging.INFO):
+                ctx = _find_context(args)
+                if ctx:
+                    _log_context(logger, ctx)
+            return await func(*args, **kwargs)
         
+        return async_wrapper
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if logger.isEnabledFor(logging.INFO):
+            ctx = _find_context(args)
+            if ctx:
+                _log_context(logger, ctx)
         return func(*args, **kwargs)
     
     return wrapper
@@ -4,14 +4,57 @@
 
 import logging
 import asyncio
-from datetime import datetime, timedelta
+import heapq
+import itertools
+import time
+from collections import deque
+from datetime import datetime, time as dt_time, timedelta
 from typing import Dict, List, Optional, Callable
-import pytz
 import discord
 
+from utils.storage import load_json_file, write_json_atomic
+
+# 관리자 알림 문구 (알림마다 한 번 채워 모든 관리자에게 같은 내용을 보냄)
+_DEADLINE_ADMIN_MESSAGE = (
+    "🔔 **마감일 임박 알림**\n\n"
+    "채널: #{channel_name}\n"
+    "마감까지: {hours_before}시간\n"
+    "현재 신청: {total_applications}명\n"
+    "고유 신청자: {unique_applicants}명"
+)
+_LOW_PARTICIPATION_MESSAGE = (
+    "⚠️ **낮은 참여도 알림**\n\n"
+    "채널: #{channel_name}\n"
+    "현재 신청: {total_applications}명\n"
+    "기준: {threshold}명\n\n"
+    "홍보나 리마인더 메시지 전송을 고려해보세요."
+)
+_HIGH_CONFLICT_MESSAGE = (
+    "🔥 **높은 충돌 알림**\n\n"
+    "채널: #{channel_name}\n"
+    "충돌 날짜 수: {conflict_count}개\n\n"
+    "충돌 날짜:\n{conflict_dates}\n\n"
+    "조정이 필요할 수 있습니다."
+)
+
+def _format_popular_dates(summary: Dict, limit: int = 5) -> str:
+    """인기 날짜를 '• 날짜 (N명 신청)' 줄 목록으로 만듭니다."""
+    date_counts = summary['date_counts']
+    return "\n".join(f"• {date} ({date_counts[date]}명 신청)" for date in summary['popular_dates'][:limit])
+
 class NotificationSystem:
     """고급 알림 시스템을 관리합니다."""
     
+    DM_RATE_LIMIT = 5  # 관리자 한 명에게 DM_RATE_WINDOW초 동안 보낼 최대 DM 수
+    DM_RATE_WINDOW = 5.0
+    DM_MAX_RETRY = 3  # 429 응답 시 최대 시도 횟수
+    MAX_CONCURRENT_SENDS = 10  # 알림 전체에서 동시에 진행할 최대 전송 수
+    EMBED_FIELD_LIMIT = 25  # 디스코드 임베드 하나에 넣을 수 있는 최대 필드 수
+    MESSAGE_EMBED_LIMIT = 10  # 메시지 하나에 보낼 수 있는 최대 임베드 수
+    MESSAGE_EMBED_CHARS = 6000  # 메시지 하나의 임베드 글자 수 합계 제한
+    MAX_SLEEP_SECONDS = 900  # 절전/시계 변경 후에도 늦지 않도록 최대 15분마다 실제 시각을 다시 확인
+    FIRED_REMINDERS_FILE = "config/fired_reminders.json"  # 재시작 후 같은 마감 알림을 다시 보내지 않도록 저장
+    
     def __init__(self, bot, settings, application_manager):
         """알림 시스템을 초기화합니다."""
         self.bot = bot
@@ -29,57 +72,259 @@ class NotificationSystem:
             'weekly_report_time': '09:00'   # 주간 보고 시간
         }
         
+        # 일일 보고 시각은 매번 파싱하지 않도록 미리 변환
+        hour, minute = map(int, self.notification_settings['daily_report_time'].split(':'))
+        self._daily_report_time = dt_time(hour, minute)
+        
         # 알림 작업 저장
         self.notification_tasks = {}
+        
+        # 타이머 휠: 모든 알림 일정을 (실행 시각 타임스탬프, 순번, 종류, 인자) 최소 힙 하나로 관리
+        self._timers = []
+        self._timer_seq = itertools.count()  # 같은 시각 항목의 순서 유지 (인자끼리는 비교하지 않음)
+        self._timer_handlers = {
+            'deadline_reminder': self._fire_deadline_reminder,
+            'daily_report': self._send_daily_report,
+            'weekly_report': self._send_weekly_report
+        }
+        # 반복 타이머: 실행할 때마다 다음 실행 시각을 계산해 다시 등록
+        self._recurring_timers = {
+            'daily_report': self._next_daily_report_time,
+            'weekly_report': self._next_weekly_report_time
+        }
+        self._fired_reminders = self._load_fired_reminders()  # 이미 보낸 (메시지 ID, 시간) 마감 알림
+        self._timers_changed = asyncio.Event()  # 세션이 바뀌면 스케줄러를 깨움
+        self._loop = None
+        
+        # 관리자 DM은 큐에 모아 워커 하나가 수신자별 전송 속도를 지키며 보냄
+        self._dm_queue = asyncio.Queue()
+        self._dm_sent_times = {}  # {관리자 ID: deque(최근 전송 시각)}
+        self._send_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SENDS)  # 채널·DM 전송 공용
+        self._last_daily_report = None  # 마지막으로 보낸 일일 보고의 (세션, 신청 수) 목록
+        self._alert_state = {}  # {메시지 ID: 현재 기준을 넘은 상태로 이미 알린 알림 종류 집합}
+        application_manager.add_session_listener(self._on_sessions_changed)
     
     async def setup_notifications(self):
         """알림 시스템을 설정합니다."""
-        # 정기적인 알림 작업 설정
-        await self._setup_deadline_reminders()
-        await self._setup_daily_reports()
-        await self._setup_weekly_reports()
+        self._loop = asyncio.get_running_loop()
+        
+        # 정기 보고와 마감 알림 타이머 등록
+        current_time = datetime.now(self.settings.tz)
+        for kind, next_time in self._recurring_timers.items():
+            self._push_timer(next_time(current_time).timestamp(), kind)
+        await self._schedule_deadline_reminders()
+        
+        # 작업 하나가 다음 타이머 시각까지 잠들었다가 알림을 처리
+        self.notification_tasks['scheduler'] = asyncio.create_task(self._scheduler())
+        self.notification_tasks['dm_worker'] = asyncio.create_task(self._dm_worker())
         
         self.logger.info("알림 시스템 설정 완료")
     
-    async def _setup_deadline_reminders(self):
-        """마감일 알림을 설정합니다."""
-        for hours in self.notification_settings['deadline_reminder_hours']:
-            # 매일 특정 시간에 마감일이 임박한 신청 확인
-            task = asyncio.create_task(self._check_deadline_reminders(hours))
-            self.notification_tasks[f'deadline_reminder_{hours}h'] = task
+    def _push_timer(self, fire_at: float, kind: str, payload: tuple = ()):
+        """타이머를 등록합니다."""
+        heapq.heappush(self._timers, (fire_at, next(self._timer_seq), kind, payload))
+    
+    def _next_daily_report_time(self, current_time: datetime) -> datetime:
+        """다음 일일 보고 시각을 계산합니다."""
+        report_time = self._daily_report_time
+        
+        next_report = current_time.replace(
+            hour=report_time.hour, 
+            minute=report_time.minute, 
+            second=0, 
+            microsecond=0
+        )
+        
+        if current_time.time() >= report_time:
+            next_report += timedelta(days=1)
+        
+        return next_report
+    
+    def _next_weekly_report_time(self, current_time: datetime) -> datetime:
+        """다음 주간 보고 시각(월요일 오전 9시)을 계산합니다."""
+        this_monday = current_time - timedelta(days=current_time.weekday())  # 월요일 = 0
+        next_report = this_monday.replace(hour=9, minute=0, second=0, microsecond=0)
+        
+        # 이번 주 보고 시각이 지났으면 다음 주 월요일
+        if next_report <= current_time:
+            next_report += timedelta(days=7)
+        
+        return next_report
+    
+    def _load_fired_reminders(self) -> set:
+        """저장된 마감 알림 전송 기록을 불러옵니다."""
+        try:
+            return {(message_id, hours_before) for message_id, hours_before in load_json_file(self.FIRED_REMINDERS_FILE)}
+        except FileNotFoundError:
+            return set()
+        except Exception as e:
+            self.logger.error("마감 알림 전송 기록 로드 실패: %s", e)
+            return set()
+    
+    def _fired_reminders_payload(self) -> List[list]:
+        """마감 알림 전송 기록을 저장할 JSON 목록으로 변환합니다."""
+        return sorted([message_id, hours_before] for message_id, hours_before in self._fired_reminders)
+    
+    def _save_fired_reminders(self, payload: List[list]):
+        """마감 알림 전송 기록을 파일에 원자적으로 저장합니다."""
+        try:
+            write_json_atomic(self.FIRED_REMINDERS_FILE, payload)
+        except Exception as e:
+            self.logger.error("마감 알림 전송 기록 저장 실패: %s", e)
     
-    async def _setup_daily_reports(self):
-        """일일 보고 알림을 설정합니다."""
-        task = asyncio.create_task(self._daily_report_scheduler())
-        self.notification_tasks['daily_report'] = task
+    def _on_sessions_changed(self):
+        """세션이 바뀌면 스케줄러를 깨워 마감 알림 일정을 다시 계산하게 합니다 (다른 스레드에서도 호출 가능)."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._timers_changed.set)
     
-    async def _setup_weekly_reports(self):
-        """주간 보고 알림을 설정합니다."""
-        task = asyncio.create_task(self._weekly_report_scheduler())
-        self.notification_tasks['weekly_report'] = task
+    async def _schedule_deadline_reminders(self):
+        """활성 세션의 마감 알림 타이머를 다시 등록합니다."""
+        now = time.time()
+        timers = [timer for timer in self._timers if timer[2] != 'deadline_reminder']
+        active_ids = set()
+        skipped = False
+        
+        # 일정 계산에는 마감 시각만 필요하므로 세션 요약은 만들지 않음
+        for message_id, deadline_ts in self.application_manager.get_active_deadlines():
+            if deadline_ts <= now:
+                continue
+            active_ids.add(message_id)
+            
+            # 이미 지난 알림 시각은 가장 임박한 것 하나만 보내고 나머지는 건너뜀
+            caught_up = False
+            for hours_before in sorted(self.notification_settings['deadline_reminder_hours']):
+                key = (message_id, hours_before)
+                fire_at = deadline_ts - hours_before * 3600
+                if key in self._fired_reminders:
+                    caught_up = caught_up or fire_at <= now
+                    continue
+                if fire_at <= now:
+                    if caught_up:
+                        self._fired_reminders.add(key)
+                        skipped = True
+                        continue
+                    caught_up = True
+                timers.append((fire_at, next(self._timer_seq), 'deadline_reminder', key))
+        
+        heapq.heapify(timers)
+        self._timers = timers
+        # 끝난 세션의 전송 기록은 더 필요 없으므로 정리
+        fired_reminders = {key for key in self._fired_reminders if key[0] in active_ids}
+        self._alert_state = {message_id: kinds for message_id, kinds in self._alert_state.items() if message_id in active_ids}
+        if skipped or len(fired_reminders) != len(self._fired_reminders):
+            self._fired_reminders = fired_reminders
+            await asyncio.to_thread(self._save_fired_reminders, self._fired_reminders_payload())
     
-    async def _check_deadline_reminders(self, hours_before: int):
-        """마감일이 임박한 신청에 대한 알림을 확인합니다."""
+    async def _scheduler(self):
+        """가장 이른 타이머 시각까지 잠들었다가 해당 알림을 실행하고, 반복 타이머는 다시 등록합니다."""
         while True:
             try:
-                current_time = datetime.now(pytz.timezone(self.settings.timezone))
-                deadline_threshold = current_time + timedelta(hours=hours_before)
+                if self._timers:
+                    # 이벤트 루프 시계는 절전 중 멈출 수 있으므로 한 번에 길게 자지 않고 실제 시각을 다시 확인
+                    timeout = min(self._timers[0][0] - time.time(), self.MAX_SLEEP_SECONDS)
+                else:
+                    timeout = None  # 예정된 타이머가 없으면 세션 변경만 기다림
                 
-                active_sessions = self.application_manager.get_active_sessions()
+                if timeout is None or timeout > 0:
+                    try:
+                        await asyncio.wait_for(self._timers_changed.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    if self._timers_changed.is_set():
+                        self._timers_changed.clear()
+                        await self._schedule_deadline_reminders()
+                    continue
                 
-                for session in active_sessions:
-                    deadline = datetime.fromisoformat(session['deadline'])
-                    
-                    # 마감일이 임박한 경우 알림
-                    if deadline <= deadline_threshold and deadline > current_time:
-                        await self._send_deadline_reminder(session, hours_before)
+                _, _, kind, payload = heapq.heappop(self._timers)
+                next_time = self._recurring_timers.get(kind)
+                if next_time is not None:
+                    # 실행 전에 다음 회차를 등록해 처리 중 오류가 나도 반복이 끊기지 않게 함
+                    current_time = datetime.now(self.settings.tz)
+                    self._push_timer(next_time(current_time).timestamp(), kind)
                 
-                # 1시간마다 확인
-                await asyncio.sleep(3600)
+                await self._timer_handlers[kind](*payload)
                 
             except Exception as e:
-                self.logger.error(f"마감일 알림 확인 중 오류: {e}")
-                await asyncio.sleep(3600)
+                self.logger.error("알림 스케줄러 오류: %s", e)
+                await asyncio.sleep(60)
+    
+    async def _fire_deadline_reminder(self, message_id: str, hours_before: int):
+        """세션이 아직 진행 중이면 마감 알림을 한 번 전송합니다."""
+        self._fired_reminders.add((message_id, hours_before))
+        
+        session = self.application_manager.get_active_session(message_id)
+        if session is not None and session['deadline_ts'] > time.time():
+            await self._send_deadline_reminder(session, hours_before)
+        
+        # 재시작해도 다시 보내지 않도록 기록 저장 (파일 쓰기는 이벤트 루프 밖에서)
+        await asyncio.to_thread(self._save_fired_reminders, self._fired_reminders_payload())
+    
+    def _queue_admin_dm(self, admin_id: int, **payload):
+        """관리자 DM을 전송 큐에 넣습니다 (payload는 user.send 인자)."""
+        self._dm_queue.put_nowait((admin_id, payload))
+    
+    def _queue_admins_dm(self, **payload):
+        """같은 DM을 모든 관리자 앞으로 전송 큐에 넣습니다."""
+        for admin_id in self.settings.admin_ids:
+            self._queue_admin_dm(admin_id, **payload)
+    
+    async def _dm_worker(self):
+        """큐에 쌓인 관리자 DM을 모아, 관리자별로는 순서대로 관리자끼리는 동시에 전송합니다."""
+        while True:
+            batch = [await self._dm_queue.get()]
+            while not self._dm_queue.empty():
+                batch.append(self._dm_queue.get_nowait())
+            
+            payloads_by_admin = {}
+            for admin_id, payload in batch:
+                payloads_by_admin.setdefault(admin_id, []).append(payload)
+            
+            try:
+                await asyncio.gather(*(
+                    self._send_admin_dms(admin_id, payloads)
+                    for admin_id, payloads in payloads_by_admin.items()
+                ))
+            finally:
+                for _ in batch:
+                    self._dm_queue.task_done()
+    
+    async def _send_admin_dms(self, admin_id: int, payloads: List[Dict]):
+        """한 관리자에게 DM들을 순서대로 전송하고, 실패는 로그만 남깁니다."""
+        for payload in payloads:
+            try:
+                await self._send_admin_dm(admin_id, payload)
+            except Exception as e:
+                self.logger.error("관리자 DM 전송 실패 (ID: %s): %s", admin_id, e)
+    
+    async def _send_admin_dm(self, admin_id: int, payload: Dict):
+        """수신자별 전송 속도 제한(토큰 버킷)을 지키며 관리자에게 DM을 보냅니다."""
+        sent_times = self._dm_sent_times.get(admin_id)
+        if sent_times is None:
+            sent_times = self._dm_sent_times[admin_id] = deque(maxlen=self.DM_RATE_LIMIT)
+        
+        # 최근 창 안에서 한도만큼 보냈으면 가장 오래된 전송이 창을 벗어날 때까지 대기
+        if len(sent_times) == self.DM_RATE_LIMIT:
+            wait = self.DM_RATE_WINDOW - (time.monotonic() - sent_times[0])
+            if wait > 0:
+                await asyncio.sleep(wait)
+        
+        user = await self.bot.get_admin_user(admin_id)
+        
+        for attempt in range(1, self.DM_MAX_RETRY + 1):
+            try:
+                async with self._send_semaphore:
+                    await user.send(**payload)
+                sent_times.append(time.monotonic())
+                return
+            except (discord.Forbidden, discord.NotFound):
+                # DM이 막혔거나 계정이 사라졌으면 캐시를 비워 다음 전송 때 다시 조회
+                self.bot.admin_users.pop(admin_id, None)
+                raise
+            except discord.HTTPException as e:
+                if e.status != 429 or attempt == self.DM_MAX_RETRY:
+                    raise
+                # 디스코드가 알려준 대기 시간이 있으면 따르고, 없으면 지수 백오프
+                await asyncio.sleep(getattr(e, 'retry_after', None) or 2 ** attempt)
     
     async def _send_deadline_reminder(self, session: Dict, hours_before: int):
         """마감일 임박 알림을 전송합니다."""
@@ -100,83 +345,53 @@ class NotificationSystem:
             if summary['popular_dates']:
                 embed.add_field(
                     name="🔥 인기 날짜",
-                    value="\n".join([f"• {date} ({summary['date_counts'][date]}명 신청)" 
-                                    for date in summary['popular_dates'][:5]]),
+                    value=_format_popular_dates(summary),
                     inline=False
                 )
             
             embed.add_field(
                 name="📅 마감일",
-                value=f"<t:{int(datetime.fromisoformat(session['deadline']).timestamp())}:R>",
+                value=f"<t:{session['deadline_ts']}:R>",
                 inline=False
             )
             
             embed.set_footer(text="아직 신청하지 않으셨다면 서둘러 신청해주세요!")
             
-            await channel.send(embed=embed)
+            async with self._send_semaphore:
+                await channel.send(embed=embed)
             
-            # 관리자에게도 알림
-            await self._notify_admins_deadline_reminder(session, hours_before)
+            # 관리자에게도 알림 (이미 찾은 채널 재사용)
+            await self._notify_admins_deadline_reminder(session, hours_before, channel)
             
         except Exception as e:
-            self.logger.error(f"마감일 알림 전송 실패: {e}")
+            self.logger.error("마감일 알림 전송 실패: %s", e)
     
-    async def _notify_admins_deadline_reminder(self, session: Dict, hours_before: int):
-        """관리자에게 마감일 임박 알림을 전송합니다."""
-        for admin_id in self.settings.admin_ids:
-            try:
-                user = self.bot.get_user(admin_id)
-                if user:
-                    summary = session['summary']
-                    channel = self.bot.get_channel(session['channel_id'])
-                    channel_name = channel.name if channel else f"채널 {session['channel_id']}"
-                    
-                    message = (
-                        f"🔔 **마감일 임박 알림**\n\n"
-                        f"채널: #{channel_name}\n"
-                        f"마감까지: {hours_before}시간\n"
-                        f"현재 신청: {summary['total_applications']}명\n"
-                        f"고유 신청자: {summary['unique_applicants']}명"
-                    )
-                    
-                    if summary['popular_dates']:
-                        message += f"\n\n🔥 인기 날짜:\n"
-                        for date in summary['popular_dates'][:3]:
-                            count = summary['date_counts'][date]
-                            message += f"• {date}: {count}명\n"
-                    
-                    await user.send(message)
-                    
-            except Exception as e:
-                self.logger.error(f"관리자 마감일 알림 전송 실패 (ID: {admin_id}): {e}")
+    def _channel_name(self, session: Dict, channel=None) -> str:
+        """세션 채널의 표시 이름을 반환합니다 (채널을 찾지 못하면 ID로 표시)."""
+        if channel is None:
+            channel = self.bot.get_channel(session['channel_id'])
+        return channel.name if channel else f"채널 {session['channel_id']}"
     
-    async def _daily_report_scheduler(self):
-        """일일 보고 스케줄러를 실행합니다."""
-        while True:
-            try:
-                current_time = datetime.now(pytz.timezone(self.settings.timezone))
-                report_time = datetime.strptime(self.notification_settings['daily_report_time'], '%H:%M').time()
-                
-                # 다음 보고 시간까지 대기
-                next_report = current_time.replace(
-                    hour=report_time.hour, 
-                    minute=report_time.minute, 
-                    second=0, 
-                    microsecond=0
-                )
-                
-                if current_time.time() >= report_time:
-                    next_report += timedelta(days=1)
-                
-                wait_seconds = (next_report - current_time).total_seconds()
-                await asyncio.sleep(wait_seconds)
-                
-                # 일일 보고 전송
-                await self._send_daily_report()
-                
-            except Exception as e:
-                self.logger.error(f"일일 보고 스케줄러 오류: {e}")
-                await asyncio.sleep(3600)
+    async def _notify_admins_deadline_reminder(self, session: Dict, hours_before: int, channel=None):
+        """관리자에게 마감일 임박 알림을 전송합니다."""
+        try:
+            summary = session['summary']
+            message = _DEADLINE_ADMIN_MESSAGE.format(
+                channel_name=self._channel_name(session, channel),
+                hours_before=hours_before,
+                total_applications=summary['total_applications'],
+                unique_applicants=summary['unique_applicants']
+            )
+            
+            if summary['popular_dates']:
+                date_counts = summary['date_counts']
+                popular_dates = "".join(f"• {date}: {date_counts[date]}명\n" for date in summary['popular_dates'][:3])
+                message += f"\n\n🔥 인기 날짜:\n{popular_dates}"
+            
+            self._queue_admins_dm(content=message)
+            
+        except Exception as e:
+            self.logger.error("관리자 마감일 알림 생성 실패: %s", e)
     
     async def _send_daily_report(self):
         """일일 보고를 전송합니다."""
@@ -186,175 +401,146 @@ class NotificationSystem:
             if not active_sessions:
                 return
             
-            for admin_id in self.settings.admin_ids:
-                try:
-                    user = self.bot.get_user(admin_id)
-                    if not user:
-                        continue
-                    
-                    embed = discord.Embed(
-                        title="📊 일일 스케줄 신청 현황 보고",
-                        description=f"현재 활성 신청 세션: {len(active_sessions)}개",
-                        color=discord.Color.blue()
-                    )
-                    
-                    for session in active_sessions:
-                        summary = session['summary']
-                        channel = self.bot.get_channel(session['channel_id'])
-                        channel_name = channel.name if channel else f"채널 {session['channel_id']}"
-                        
-                        # 참여도 평가
-                        participation_level = "🟢 높음" if summary['total_applications'] >= 5 else \
-                                           "🟡 보통" if summary['total_applications'] >= 3 else "🔴 낮음"
-                        
-                        embed.add_field(
-                            name=f"#{channel_name}",
-                            value=(
-                                f"신청: {summary['total_applications']}명\n"
-                                f"참여도: {participation_level}\n"
-                                f"마감: <t:{int(datetime.fromisoformat(session['deadline']).timestamp())}:R>"
-                            ),
-                            inline=True
-                        )
-                    
-                    await user.send(embed=embed)
-                    
-                except Exception as e:
-                    self.logger.error(f"관리자 일일 보고 전송 실패 (ID: {admin_id}): {e}")
-                    
-        except Exception as e:
-            self.logger.error(f"일일 보고 전송 실패: {e}")
-    
-    async def _weekly_report_scheduler(self):
-        """주간 보고 스케줄러를 실행합니다."""
-        while True:
-            try:
-                current_time = datetime.now(pytz.timezone(self.settings.timezone))
-                
-                # 다음 월요일 오전 9시까지 대기
-                days_ahead = 7 - current_time.weekday()  # 월요일 = 0
-                if days_ahead == 7:
-                    days_ahead = 0
-                
-                next_monday = current_time + timedelta(days=days_ahead)
-                next_report = next_monday.replace(
-                    hour=9, minute=0, second=0, microsecond=0
-                )
+            # 지난 보고 이후 세션과 신청 수가 그대로면 같은 보고를 다시 보내지 않음
+            report_state = tuple(
+                (session['message_id'], session['summary']['total_applications'])
+                for session in active_sessions
+            )
+            if report_state == self._last_daily_report:
+                self.logger.info("변경 사항이 없어 일일 보고를 건너뜁니다")
+                return
+            
+            # 모든 관리자에게 같은 보고를 보내므로 한 번만 생성
+            embed = discord.Embed(
+                title="📊 일일 스케줄 신청 현황 보고",
+                description=f"현재 활성 신청 세션: {len(active_sessions)}개",
+                color=discord.Color.blue()
+            )
+            embeds = [embed]
+            
+            for session in active_sessions:
+                # 필드 수 제한을 넘으면 이어지는 임베드에 추가
+                if len(embed.fields) >= self.EMBED_FIELD_LIMIT:
+                    embed = discord.Embed(color=discord.Color.blue())
+                    embeds.append(embed)
                 
-                wait_seconds = (next_report - current_time).total_seconds()
-                await asyncio.sleep(wait_seconds)
+                summary = session['summary']
+                channel_name = self._channel_name(session)
                 
-                # 주간 보고 전송
-                await self._send_weekly_report()
+                # 참여도 평가
+                participation_level = "🟢 높음" if summary['total_applications'] >= 5 else \
+                                   "🟡 보통" if summary['total_applications'] >= 3 else "🔴 낮음"
                 
-            except Exception as e:
-                self.logger.error(f"주간 보고 스케줄러 오류: {e}")
-                await asyncio.sleep(86400)  # 1일 대기
+                embed.add_field(
+                    name=f"#{channel_name}",
+                    value=(
+                        f"신청: {summary['total_applications']}명\n"
+                        f"참여도: {participation_level}\n"
+                        f"마감: <t:{session['deadline_ts']}:R>"
+                    ),
+                    inline=True
+                )
+            
+            # 메시지당 임베드 수·글자 수 제한에 맞춰 나눠 전송
+            batch, batch_chars = [], 0
+            for embed in embeds:
+                if batch and (len(batch) >= self.MESSAGE_EMBED_LIMIT or batch_chars + len(embed) > self.MESSAGE_EMBED_CHARS):
+                    self._queue_admins_dm(embeds=batch)
+                    batch, batch_chars = [], 0
+                batch.append(embed)
+                batch_chars += len(embed)
+            self._queue_admins_dm(embeds=batch)
+            self._last_daily_report = report_state
+                    
+        except Exception as e:
+            self.logger.error("일일 보고 전송 실패: %s", e)
     
     async def _send_weekly_report(self):
         """주간 보고를 전송합니다."""
         try:
-            # 지난 주 데이터 수집
-            week_ago = datetime.now(pytz.timezone(self.settings.timezone)) - timedelta(days=7)
-            
             # 통계 데이터 수집 (실제 구현에서는 더 상세한 통계 필요)
             total_sessions = len(self.application_manager.applications)
             active_sessions = len(self.application_manager.get_active_sessions())
             
-            for admin_id in self.settings.admin_ids:
-                try:
-                    user = self.bot.get_user(admin_id)
-                    if not user:
-                        continue
-                    
-                    embed = discord.Embed(
-                        title="📈 주간 스케줄 신청 통계",
-                        description=f"지난 주 활동 요약",
-                        color=discord.Color.purple()
-                    )
-                    
-                    embed.add_field(
-                        name="📊 전체 현황",
-                        value=(
-                            f"총 신청 세션: {total_sessions}개\n"
-                            f"활성 세션: {active_sessions}개\n"
-                            f"마감된 세션: {total_sessions - active_sessions}개"
-                        ),
-                        inline=False
-                    )
-                    
-                    embed.add_field(
-                        name="💡 개선 제안",
-                        value=(
-                            "• 참여도가 낮은 채널에 대한 홍보 강화\n"
-                            "• 인기 날짜 충돌 해결 방안 검토\n"
-                            "• 신청 기간 조정 고려"
-                        ),
-                        inline=False
-                    )
-                    
-                    await user.send(embed=embed)
-                    
-                except Exception as e:
-                    self.logger.error(f"관리자 주간 보고 전송 실패 (ID: {admin_id}): {e}")
+            embed = discord.Embed(
+                title="📈 주간 스케줄 신청 통계",
+                description=f"지난 주 활동 요약",
+                color=discord.Color.purple()
+            )
+            
+            embed.add_field(
+                name="📊 전체 현황",
+                value=(
+                    f"총 신청 세션: {total_sessions}개\n"
+                    f"활성 세션: {active_sessions}개\n"
+                    f"마감된 세션: {total_sessions - active_sessions}개"
+                ),
+                inline=False
+            )
+            
+            embed.add_field(
+                name="💡 개선 제안",
+                value=(
+                    "• 참여도가 낮은 채널에 대한 홍보 강화\n"
+                    "• 인기 날짜 충돌 해결 방안 검토\n"
+                    "• 신청 기간 조정 고려"
+                ),
+                inline=False
+            )
+            
+            self._queue_admins_dm(embed=embed)
                     
         except Exception as e:
-            self.logger.error(f"주간 보고 전송 실패: {e}")
+            self.logger.error("주간 보고 전송 실패: %s", e)
+    
+    def _should_alert(self, message_id: str, kind: str, triggered: bool) -> bool:
+        """기준을 새로 넘었을 때만 True를 반환합니다 (같은 상태가 이어지는 동안은 다시 알리지 않음)."""
+        alerted = self._alert_state.setdefault(message_id, set())
+        if not triggered:
+            alerted.discard(kind)
+            return False
+        if kind in alerted:
+            return False
+        alerted.add(kind)
+        return True
     
     async def send_low_participation_alert(self, session: Dict):
         """낮은 참여도 알림을 전송합니다."""
         summary = session['summary']
+        below_threshold = summary['total_applications'] < self.notification_settings['low_participation_threshold']
         
-        if summary['total_applications'] < self.notification_settings['low_participation_threshold']:
-            for admin_id in self.settings.admin_ids:
-                try:
-                    user = self.bot.get_user(admin_id)
-                    if user:
-                        channel = self.bot.get_channel(session['channel_id'])
-                        channel_name = channel.name if channel else f"채널 {session['channel_id']}"
-                        
-                        await user.send(
-                            f"⚠️ **낮은 참여도 알림**\n\n"
-                            f"채널: #{channel_name}\n"
-                            f"현재 신청: {summary['total_applications']}명\n"
-                            f"기준: {self.notification_settings['low_participation_threshold']}명\n\n"
-                            f"홍보나 리마인더 메시지 전송을 고려해보세요."
-                        )
-                        
-                except Exception as e:
-                    self.logger.error(f"낮은 참여도 알림 전송 실패 (ID: {admin_id}): {e}")
+        if self._should_alert(session['message_id'], 'low_participation', below_threshold):
+            try:
+                self._queue_admins_dm(content=_LOW_PARTICIPATION_MESSAGE.format(
+                    channel_name=self._channel_name(session),
+                    total_applications=summary['total_applications'],
+                    threshold=self.notification_settings['low_participation_threshold']
+                ))
+                
+            except Exception as e:
+                self.logger.error("낮은 참여도 알림 생성 실패: %s", e)
     
     async def send_high_conflict_alert(self, session: Dict):
         """높은 충돌 알림을 전송합니다."""
         summary = session['summary']
+        high_conflict = len(summary['popular_dates']) >= self.notification_settings['high_conflict_threshold']
         
-        if len(summary['popular_dates']) >= self.notification_settings['high_conflict_threshold']:
-            for admin_id in self.settings.admin_ids:
-                try:
-                    user = self.bot.get_user(admin_id)
-                    if user:
-                        channel = self.bot.get_channel(session['channel_id'])
-                        channel_name = channel.name if channel else f"채널 {session['channel_id']}"
-                        
-                        conflict_dates = "\n".join([
-                            f"• {date} ({summary['date_counts'][date]}명 신청)"
-                            for date in summary['popular_dates'][:5]
-                        ])
-                        
-                        await user.send(
-                            f"🔥 **높은 충돌 알림**\n\n"
-                            f"채널: #{channel_name}\n"
-                            f"충돌 날짜 수: {len(summary['popular_dates'])}개\n\n"
-                            f"충돌 날짜:\n{conflict_dates}\n\n"
-                            f"조정이 필요할 수 있습니다."
-                        )
-                        
-                except Exception as e:
-                    self.logger.error(f"높은 충돌 알림 전송 실패 (ID: {admin_id}): {e}")
+        if self._should_alert(session['message_id'], 'high_conflict', high_conflict):
+            try:
+                self._queue_admins_dm(content=_HIGH_CONFLICT_MESSAGE.format(
+                    channel_name=self._channel_name(session),
+                    conflict_count=len(summary['popular_dates']),
+                    conflict_dates=_format_popular_dates(summary)
+                ))
+                
+            except Exception as e:
+                self.logger.error("높은 충돌 알림 생성 실패: %s", e)
     
-    def shutdown(self):
-        """알림 시스템을 종료합니다."""
-        for task_name, task in self.notification_tasks.items():
-            if not task.done():
-                task.cancel()
+    async def shutdown(self):
+        """알림 시스템을 종료합니다 (작업 취소가 끝날 때까지 기다림)."""
+        tasks = list(self.notification_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.notification_tasks.clear()
         self.logger.info("알림 시스템 종료됨") 
\ No newline at end of file
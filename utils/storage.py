@@ -0,0 +1,86 @@
+"""
+데이터 파일 입출력 도우미.
+"""
+
+import json
+import mmap
+import os
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 사용
+    orjson = None
+
+def loads_json(data):
+    """JSON 문자열/바이트를 파싱합니다 (orjson이 있으면 사용)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load_json_file(path: str):
+    """
+    JSON 파일을 메모리 매핑으로 읽어 파싱합니다.
+
+    Args:
+        path: 읽을 JSON 파일 경로
+
+    Returns:
+        파싱된 데이터
+
+    Raises:
+        FileNotFoundError: 파일이 없을 때
+        ValueError: 파일이 비어 있거나 JSON이 잘못되었을 때
+    """
+    with open(path, 'rb') as f:
+        # 빈 파일은 매핑할 수 없으므로 잘못된 JSON과 같이 처리
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is not None:
+                # 복사 없이 매핑된 버퍼를 그대로 파싱
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+            return json.loads(mm[:])
+
+def dump_json(data) -> bytes:
+    """데이터를 들여쓰기된 UTF-8 JSON 바이트로 직렬화합니다 (orjson이 있으면 사용)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def dump_json_line(data) -> str:
+    """데이터를 JSONL 한 줄(개행 포함)로 직렬화합니다 (orjson이 있으면 사용)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8') + "\n"
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+def write_json_atomic(path: str, data):
+    """
+    JSON 파일을 원자적으로 저장합니다.
+
+    Args:
+        path: 저장할 파일 경로
+        data: 저장할 데이터
+    """
+    write_bytes_atomic(path, dump_json(data))
+
+def write_bytes_atomic(path: str, payload: bytes):
+    """
+    바이트 데이터를 파일에 원자적으로 저장합니다.
+
+    임시 파일에 한 번에 쓰고 디스크에 반영한 뒤 os.replace로 교체하므로,
+    저장 도중 중단되어도 기존 파일이 깨지지 않습니다.
+
+    Args:
+        path: 저장할 파일 경로
+        payload: 저장할 바이트
+    """
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise